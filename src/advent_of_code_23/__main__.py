@@ -0,0 +1,5 @@
+'''Entry point for `python -m advent_of_code_23`'''
+
+from advent_of_code_23.runner import main
+
+main()
@@ -0,0 +1,150 @@
+'''Benchmark the solutions with synthetic inputs of growing size.
+
+For every day, the solutions are run over a ladder of input sizes (roughly
+1x to 1000x the smallest one) and the stage times and throughput are
+recorded, so scaling regressions show up as a change in the shape of the
+curve:
+
+    python -m advent_of_code_23.benchmark --days 14,17 -f csv
+'''
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=missing-class-docstring
+
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from advent_of_code_23.generators import GENERATORS, generate
+from advent_of_code_23.runner import parse_days, run_day, write_rows
+
+# Grid sides grow by ~sqrt(10) so that every step is ~10x the input size.
+# The ladder of the exponential longest hike is kept short. The joined race
+# of day 6 overflows past 9 races, and the circuits of day 20 always take
+# 110k button pushes, so they scale with the number of counters only.
+SIZES: dict[int, tuple[int, ...]] = {
+    1: (100, 1_000, 10_000),
+    2: (100, 1_000, 10_000),
+    3: (10, 32, 100, 316),
+    4: (100, 1_000, 10_000),
+    5: (10, 100, 1_000, 10_000),
+    6: (1, 3, 9),
+    7: (100, 1_000, 10_000),
+    8: (10, 100, 1_000),
+    9: (20, 200, 2_000, 20_000),
+    10: (10, 32, 100, 316),
+    11: (10, 32, 100, 316, 1_000),
+    12: (10, 100, 1_000, 10_000),
+    13: (10, 100, 1_000),
+    14: (10, 32, 100, 316),
+    15: (100, 1_000, 10_000),
+    16: (10, 32, 100, 316, 1_000),
+    17: (10, 32, 100, 316),
+    18: (10, 100, 1_000, 10_000),
+    19: (10, 100, 1_000),
+    20: (1, 3, 10),
+    21: (5, 16, 50, 158),
+    22: (10, 100, 1_000),
+    23: (2, 3, 4, 5, 6),
+    24: (5, 50, 500),
+    25: (10, 100, 1_000),
+}
+
+@dataclass
+class BenchmarkResult:
+    day: int
+    size: int
+    input_bytes: int
+    parse_time: float | None = None
+    part_1_time: float | None = None
+    part_2_time: float | None = None
+    total_time: float | None = None
+    bytes_per_second: float | None = None
+    error: str | None = None
+
+def benchmark_day(
+    day: int,
+    sizes: Iterable[int] | None = None,
+    seed: int = 0,
+    max_seconds: float | None = None
+) -> list[BenchmarkResult]:
+    '''Run a day for every size, stopping once a run exceeds `max_seconds`'''
+    results = []
+    for size in SIZES[day] if sizes is None else sizes:
+        input_text = generate(day, size, seed)
+        report = run_day(day, input_text)
+
+        total_time = report.total_time
+        result = BenchmarkResult(
+            day=day,
+            size=size,
+            input_bytes=len(input_text.encode()),
+            parse_time=report.parse_time,
+            part_1_time=report.part_1_time,
+            part_2_time=report.part_2_time,
+            total_time=total_time,
+            error=report.error
+        )
+        if total_time > 0:
+            result.bytes_per_second = result.input_bytes / total_time
+        results.append(result)
+
+        if report.error or (max_seconds is not None and total_time > max_seconds):
+            break
+    return results
+
+def benchmark_days(
+    days: Iterable[int], seed: int = 0, max_seconds: float | None = None
+) -> list[BenchmarkResult]:
+    results = []
+    for day in days:
+        results.extend(benchmark_day(day, seed=seed, max_seconds=max_seconds))
+    return results
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m advent_of_code_23.benchmark',
+        description='Benchmark the solutions with scaled synthetic inputs.'
+    )
+    parser.add_argument(
+        '-d', '--days', type=parse_days, default=tuple(GENERATORS),
+        help='Days to benchmark, e.g. "5,14-17" (default: all)'
+    )
+    parser.add_argument(
+        '-s', '--seed', type=int, default=0,
+        help='Seed of the input generators (default: 0)'
+    )
+    parser.add_argument(
+        '-t', '--max-seconds', type=float, default=60.0,
+        help='Skip bigger sizes of a day after a run slower than this'
+    )
+    parser.add_argument(
+        '-f', '--format', choices=('json', 'csv'), default='json',
+        help='Report format (default: json)'
+    )
+    parser.add_argument(
+        '-o', '--output', type=Path, default=None,
+        help='Write the report to this file instead of stdout'
+    )
+    return parser
+
+def main(argv: list[str] | None = None):
+    arguments = build_argument_parser().parse_args(argv)
+    unknown = set(arguments.days) - set(GENERATORS)
+    if unknown:
+        raise SystemExit(f'There are no input generators for days {sorted(unknown)}')
+
+    results = benchmark_days(
+        arguments.days, arguments.seed, arguments.max_seconds
+    )
+
+    if arguments.output is None:
+        write_rows(results, sys.stdout, arguments.format)
+    else:
+        with open(arguments.output, 'w', encoding='utf-8', newline='') as output:
+            write_rows(results, output, arguments.format)
+
+if __name__ == "__main__":
+    main()
@@ -34,11 +34,17 @@ def read_calibration_value(text: str) -> int:
 
     return int(first + last)
 
-def main(input_text: str):
-    total = sum(
+def parse(input_text: str) -> list[str]:
+    return input_text.splitlines()
+
+def solve_part_1(calibration_lines: list[str]) -> int:
+    return sum(
         read_calibration_value(calibration_line)
-        for calibration_line in input_text.splitlines()
+        for calibration_line in calibration_lines
     )
+
+def main(input_text: str):
+    total = solve_part_1(parse(input_text))
     print(f'Solution: {total}')
 
 if __name__ == "__main__":
@@ -56,20 +56,28 @@ class Game:
             for max_colour, cube in zip(self.max_colours, cubes)
         )
 
-def main(input_text: str):
+def parse(input_text: str) -> list[Game]:
+    return [Game.from_string(line) for line in input_text.splitlines()]
 
-    games = [Game.from_string(line) for line in input_text.splitlines()]
+def solve_part_1(games: list[Game]) -> int:
     cubes_guess = (12, 13, 14)
-    total = sum(
+    return sum(
         game.id_number for game in games
         if game.check_possible_cubes(cubes_guess)
     )
+
+def solve_part_2(games: list[Game]) -> int:
+    return sum(game.power for game in games)
+
+def main(input_text: str):
+
+    games = parse(input_text)
+    total = solve_part_1(games)
     print(f'Solution part 1: {total}')
 
-    total_power = sum(game.power for game in games)
+    total_power = solve_part_2(games)
     print(f'Solution part 2: {total_power}')
 
-
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read()
     main(INPUT_TEXT)
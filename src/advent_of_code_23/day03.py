@@ -114,13 +114,23 @@ def find_gears(
         if len(numbers) == 2
     )
 
+def parse(input_text: str) -> str:
+    return input_text
+
+def solve_part_1(schematic_text: str) -> int:
+    part_numbers = find_schematic_part_numbers(schematic_text)
+    return sum(part_numbers)
+
+def solve_part_2(schematic_text: str) -> int:
+    gears = find_gears(schematic_text)
+    return sum(gear[1] * gear[2] for gear in gears)
+
 def main(input_text: str):
-    part_numbers = find_schematic_part_numbers(input_text)
-    part_numbers_sum = sum(part_numbers)
+    schematic_text = parse(input_text)
+    part_numbers_sum = solve_part_1(schematic_text)
     print(f'Solution part 1: {part_numbers_sum}')
 
-    gears = find_gears(input_text)
-    gear_ratio_sum = sum(gear[1] * gear[2] for gear in gears)
+    gear_ratio_sum = solve_part_2(schematic_text)
     print(f'Solution part 2: {gear_ratio_sum}')
 
 if __name__ == "__main__":
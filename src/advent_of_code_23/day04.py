@@ -52,13 +52,22 @@ def play_all_cards(cards: Iterable[Card]) -> int:
             card_amounts[win_index] += card_amounts[card_index]
     return sum(card_amounts)
 
-def main(input_text: str):
+def parse(input_text: str) -> list[Card]:
     input_lines = input_text.splitlines()
-    cards = [Card.from_string(line) for line in input_lines]
-    total_points = sum(card.score for card in cards)
+    return [Card.from_string(line) for line in input_lines]
+
+def solve_part_1(cards: list[Card]) -> int:
+    return sum(card.score for card in cards)
+
+def solve_part_2(cards: list[Card]) -> int:
+    return play_all_cards(cards)
+
+def main(input_text: str):
+    cards = parse(input_text)
+    total_points = solve_part_1(cards)
     print(f'Solution part 1: {total_points}')
 
-    total_cards = play_all_cards(cards)
+    total_cards = solve_part_2(cards)
     print(f'Solution part 2: {total_cards}')
 
 if __name__ == "__main__":
@@ -3,11 +3,14 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=missing-class-docstring
 
-from collections import defaultdict
+from bisect import bisect_right
+from collections import defaultdict, deque
 from dataclasses import dataclass
 import sys
 import re
-from typing import Self
+from typing import Iterable, Iterator, Self
+
+import numpy as np
 
 @dataclass(unsafe_hash=True)
 class AlmanacMapRange:
@@ -24,6 +27,147 @@ class AlmanacMapRange:
         offset = source - self.source_start
         return self.destination_start + offset
 
+class IntervalMap:
+    '''Conversion map as sorted, non-overlapping source intervals.
+
+    Values outside every interval are not converted. Lookups are a binary
+    search over the interval starts.
+    '''
+
+    def __init__(self, map_ranges: Iterable[AlmanacMapRange]) -> None:
+        map_ranges = sorted(map_ranges, key=lambda map_range: map_range.source_start)
+
+        self.starts: list[int] = []
+        self.stops: list[int] = []
+        self.offsets: list[int] = []
+        for map_range in map_ranges:
+            if map_range.length <= 0:
+                continue
+            if self.stops and map_range.source_start < self.stops[-1]:
+                raise ValueError(f'Overlapping map ranges at {map_range}')
+            self.starts.append(map_range.source_start)
+            self.stops.append(map_range.source_start + map_range.length)
+            self.offsets.append(
+                map_range.destination_start - map_range.source_start
+            )
+
+        self._arrays: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+    @classmethod
+    def from_pieces(cls, pieces: Iterable[tuple[int, int, int]]) -> Self:
+        '''Build from sorted (start, stop, offset) pieces, merging neighbours'''
+        interval_map = cls(())
+        starts, stops, offsets = (
+            interval_map.starts, interval_map.stops, interval_map.offsets
+        )
+        for start, stop, offset in pieces:
+            if offset == 0 or start >= stop:
+                continue # Not converted
+            if stops and stops[-1] == start and offsets[-1] == offset:
+                stops[-1] = stop
+            else:
+                starts.append(start)
+                stops.append(stop)
+                offsets.append(offset)
+        return interval_map
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def offset_at(self, value: int) -> int:
+        index = bisect_right(self.starts, value) - 1
+        if index >= 0 and value < self.stops[index]:
+            return self.offsets[index]
+        return 0
+
+    def then(self, other: Self) -> Self:
+        '''Map that converts with this map and then with the other one.
+
+        The result is constant between consecutive breakpoints: the bounds
+        of the intervals of both maps, and the values this map converts to
+        the bounds of the other one.
+        '''
+        other_bounds = sorted({*other.starts, *other.stops})
+        breakpoints = {*self.starts, *self.stops, *other_bounds}
+        for start, stop, offset in zip(self.starts, self.stops, self.offsets):
+            first = bisect_right(other_bounds, start + offset)
+            last = bisect_right(other_bounds, stop + offset - 1)
+            breakpoints.update(
+                bound - offset for bound in other_bounds[first:last]
+            )
+
+        sorted_breakpoints = sorted(breakpoints)
+        pieces = []
+        index = 0 # Interval of this map at or after the current breakpoint
+        for start, stop in zip(sorted_breakpoints, sorted_breakpoints[1:]):
+            while index < len(self.stops) and self.stops[index] <= start:
+                index += 1
+            if index < len(self.starts) and self.starts[index] <= start:
+                offset = self.offsets[index]
+            else:
+                offset = 0
+            pieces.append((start, stop, offset + other.offset_at(start + offset)))
+        return self.from_pieces(pieces)
+
+    def convert(self, value: int) -> int:
+        index = bisect_right(self.starts, value) - 1
+        if index >= 0 and value < self.stops[index]:
+            return value + self.offsets[index]
+        return value
+
+    def convert_array(self, values: np.ndarray) -> np.ndarray:
+        '''Convert an int64 array of values at once'''
+        if self._arrays is None:
+            self._arrays = tuple(
+                np.array(column, dtype=np.int64)
+                for column in (self.starts, self.stops, self.offsets)
+            )
+        starts, stops, offsets = self._arrays
+
+        values = np.asarray(values, dtype=np.int64)
+        if not len(self):
+            return values.copy()
+
+        indices = np.searchsorted(starts, values, side='right') - 1
+        clipped = np.maximum(indices, 0)
+        inside = (indices >= 0) & (values < stops[clipped])
+        return values + np.where(inside, offsets[clipped], 0)
+
+    def convert_range(self, source_range: range) -> list[range]:
+        '''Split a range by the intervals it crosses and convert each piece'''
+        result_ranges = []
+        start, stop = source_range.start, source_range.stop
+        index = max(bisect_right(self.starts, start) - 1, 0)
+
+        while start < stop:
+            if index == len(self.starts) or stop <= self.starts[index]:
+                result_ranges.append(range(start, stop)) # No more intervals
+                break
+            if start < self.starts[index]:
+                result_ranges.append(range(start, self.starts[index])) # Gap
+                start = self.starts[index]
+            if start < self.stops[index]:
+                piece_stop = min(stop, self.stops[index])
+                offset = self.offsets[index]
+                result_ranges.append(range(start + offset, piece_stop + offset))
+                start = piece_stop
+            index += 1
+
+        return result_ranges
+
+def merge_ranges(ranges: Iterable[range]) -> list[range]:
+    '''Sort 1 step ranges and coalesce the overlapping or adjacent ones'''
+    merged: list[range] = []
+    for current in sorted(ranges, key=lambda current: current.start):
+        if not current:
+            continue
+        if merged and current.start <= merged[-1].stop:
+            last = merged[-1]
+            merged[-1] = range(last.start, max(last.stop, current.stop))
+        else:
+            merged.append(current)
+    return merged
+
 class Almanac:
 
     def __init__(
@@ -33,96 +177,118 @@ class Almanac:
     ):
         self.seeds = seeds
         self.maps = maps
+        self.interval_maps = {
+            map_key: IntervalMap(map_ranges)
+            for map_key, map_ranges in maps.items()
+        }
+        self.composed_maps: dict[tuple[str, str], IntervalMap] = {}
 
-    def convert_unit(
-        self, source_value: int, source_type: str, destination_type: str
-    ) -> int:
-        conversion_map = self.maps.get((source_type, destination_type))
-        if not conversion_map:
+    def find_chain(
+        self, source_type: str, destination_type: str
+    ) -> tuple[tuple[str, str], ...]:
+        '''Shortest sequence of maps between two types, from the headers'''
+        previous: dict[str, str | None] = {source_type: None}
+        pending = deque((source_type,))
+        while pending and destination_type not in previous:
+            current = pending.popleft()
+            for map_source, map_destination in self.maps:
+                if map_source == current and map_destination not in previous:
+                    previous[map_destination] = current
+                    pending.append(map_destination)
+
+        if destination_type not in previous:
             raise ValueError(
                 f'Cannot convert from {source_type=} to {destination_type=}'
             )
-        for conversion_range in conversion_map:
-            destination = conversion_range.get_destination(source_value)
-            if destination is not None:
-                return destination
-        return source_value
 
-    def convert_unit_range(
-        self, source_range: range, source_type: str, destination_type: str
-    ) -> tuple[range, ...]:
+        chain = []
+        current = destination_type
+        while (before := previous[current]) is not None:
+            chain.append((before, current))
+            current = before
+        return tuple(reversed(chain))
 
-        if source_range.step != 1:
-            raise ValueError('Only 1 step ranges allowed!')
+    def get_composed_map(
+        self, source_type: str, destination_type: str
+    ) -> IntervalMap:
+        '''Single map doing every conversion of the chain, built once'''
+        map_key = (source_type, destination_type)
+        if map_key not in self.composed_maps:
+            composed = IntervalMap(())
+            for conversion in self.find_chain(source_type, destination_type):
+                composed = composed.then(self.interval_maps[conversion])
+            self.composed_maps[map_key] = composed
+        return self.composed_maps[map_key]
 
-        conversion_map = self.maps.get((source_type, destination_type))
-        if conversion_map is None:
+    def get_interval_map(
+        self, source_type: str, destination_type: str
+    ) -> IntervalMap:
+        interval_map = self.interval_maps.get((source_type, destination_type))
+        if interval_map is None:
             raise ValueError(
                 f'Cannot convert from {source_type=} to {destination_type=}'
             )
+        return interval_map
 
-        split_points = set()
-        for conversion_range in conversion_map:
-            if (
-                start := conversion_range.source_start
-            ) in source_range:
-                split_points.add(start)
-            if (
-                next_start := conversion_range.source_start + conversion_range.length
-            ) in source_range:
-                split_points.add(next_start)
-        split_points.add(source_range.start)
-        split_points.add(source_range.stop)
+    def convert_unit(
+        self, source_value: int, source_type: str, destination_type: str
+    ) -> int:
+        return self.get_interval_map(
+            source_type, destination_type
+        ).convert(source_value)
 
-        result_ranges = []
-        sorted_split_points = sorted(split_points)
-        for index, _ in enumerate(sorted_split_points[:-1]):
-            start = self.convert_unit(
-                sorted_split_points[index], source_type, destination_type
-            )
-            end = self.convert_unit(
-                sorted_split_points[index+1] - 1, source_type, destination_type
-            ) + 1
+    def convert_unit_range(
+        self, source_range: range, source_type: str, destination_type: str
+    ) -> tuple[range, ...]:
 
-            result_ranges.append(range(start, end))
+        if source_range.step != 1:
+            raise ValueError('Only 1 step ranges allowed!')
 
-        return tuple(result_ranges)
+        return tuple(self.get_interval_map(
+            source_type, destination_type
+        ).convert_range(source_range))
 
     def find_seed_location_ranges(
         self, seed_range: range
     ) -> tuple[range, ...]:
 
-        conversions = (
-            ('seed', 'soil'),
-            ('soil', 'fertilizer'),
-            ('fertilizer', 'water'),
-            ('water', 'light'),
-            ('light', 'temperature'),
-            ('temperature', 'humidity'),
-            ('humidity', 'location'),
-        )
-
-        ranges = [seed_range]
-        for conversion in conversions:
-            new_ranges = []
-            for previous_range in ranges:
-                new_ranges.extend(self.convert_unit_range(
-                    previous_range, conversion[0], conversion[1]
-                ))
-            ranges = new_ranges
+        return self.find_locations_ranges((seed_range,))
 
-        return tuple(ranges)
+    def find_locations_ranges(
+        self, seed_ranges: Iterable[range]
+    ) -> tuple[range, ...]:
+        '''Merged location ranges of many seed ranges'''
+        composed_map = self.get_composed_map('seed', 'location')
+        return tuple(merge_ranges(
+            converted
+            for seed_range in merge_ranges(seed_ranges)
+            for converted in composed_map.convert_range(seed_range)
+        ))
 
     def find_seed_location(self, seed: int) -> int:
+        return self.get_composed_map('seed', 'location').convert(seed)
 
-        soil = self.convert_unit(seed, 'seed', 'soil')
-        fertilizer = self.convert_unit(soil, 'soil', 'fertilizer')
-        water = self.convert_unit(fertilizer, 'fertilizer', 'water')
-        light = self.convert_unit(water, 'water', 'light')
-        temperature = self.convert_unit(light, 'light', 'temperature')
-        humidity = self.convert_unit(temperature, 'temperature', 'humidity')
-        location = self.convert_unit(humidity, 'humidity', 'location')
-        return location
+    def iter_seed_locations(
+        self, seeds: np.ndarray, chunk_size: int = 1 << 20
+    ) -> Iterator[np.ndarray]:
+        '''Locations of an array of seeds, one chunk at a time.
+
+        Only a chunk of seeds is converted at once, so the memory stays
+        bounded even for huge (or memory mapped) seed arrays.
+        '''
+        if chunk_size < 1:
+            raise ValueError(f'Invalid chunk size {chunk_size}')
+        composed_map = self.get_composed_map('seed', 'location')
+        for first in range(0, len(seeds), chunk_size):
+            yield composed_map.convert_array(seeds[first:first + chunk_size])
+
+    def find_seed_locations(
+        self, seeds: np.ndarray, chunk_size: int = 1 << 20
+    ) -> np.ndarray:
+        chunks = list(self.iter_seed_locations(seeds, chunk_size))
+        if not chunks:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(chunks)
 
     @classmethod
     def from_string(cls, almanac_text: str) -> Self:
@@ -155,17 +321,28 @@ class Almanac:
             maps = {k: tuple(v) for k, v in maps.items()}
         )
 
-def main(input_text: str):
-    almanac = Almanac.from_string(input_text)
-    locations = [almanac.find_seed_location(seed) for seed in almanac.seeds]
-    print(f'Solution part 1: {min(locations)}')
+def parse(input_text: str) -> Almanac:
+    return Almanac.from_string(input_text)
+
+def solve_part_1(almanac: Almanac) -> int:
+    seeds = np.array(almanac.seeds, dtype=np.int64)
+    return min(
+        int(locations.min()) for locations in almanac.iter_seed_locations(seeds)
+    )
 
-    results = []
+def solve_part_2(almanac: Almanac) -> int:
     seed_pairs = tuple(zip(*([iter(almanac.seeds)] * 2)))
-    for seed_pair in seed_pairs:
-        seed_range = range(seed_pair[0], seed_pair[0] + seed_pair[1])
-        results.extend(almanac.find_seed_location_ranges(seed_range))
-    second_locations_min = min(result.start for result in results)
+    results = almanac.find_locations_ranges(
+        range(seed_pair[0], seed_pair[0] + seed_pair[1])
+        for seed_pair in seed_pairs
+    )
+    return results[0].start
+
+def main(input_text: str):
+    almanac = parse(input_text)
+    print(f'Solution part 1: {solve_part_1(almanac)}')
+
+    second_locations_min = solve_part_2(almanac)
     print(f'Solution part 2: {second_locations_min}')
 
 if __name__ == "__main__":
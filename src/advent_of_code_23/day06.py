@@ -32,15 +32,32 @@ def find_winners(time: int, distance: int) -> range:
 
     return range(math.floor(low) + 1, math.ceil(up))
 
-def main(input_text: str):
-    sheet = parse_sheet(input_text)
+def parse(input_text: str) -> tuple[
+    tuple[tuple[int, int], ...], tuple[int, int]
+]:
+    return parse_sheet(input_text), parse_sheet_singular(input_text)
+
+def solve_part_1(
+    sheets: tuple[tuple[tuple[int, int], ...], tuple[int, int]]
+) -> int:
+    sheet, _ = sheets
     winners = (len(find_winners(time, distance)) for time, distance in sheet)
-    winners_prod = math.prod(winners)
-    print(f'Solution part 1: {winners_prod}')
+    return math.prod(winners)
 
-    singular_sheet = parse_sheet_singular(input_text)
+def solve_part_2(
+    sheets: tuple[tuple[tuple[int, int], ...], tuple[int, int]]
+) -> int:
+    _, singular_sheet = sheets
     winners = find_winners(*singular_sheet)
-    print(f'Solution part 1: {len(winners)}')
+    return len(winners)
+
+def main(input_text: str):
+    sheets = parse(input_text)
+    winners_prod = solve_part_1(sheets)
+    print(f'Solution part 1: {winners_prod}')
+
+    winners_count = solve_part_2(sheets)
+    print(f'Solution part 1: {winners_count}')
 
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read()
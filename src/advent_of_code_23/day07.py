@@ -215,20 +215,29 @@ class HandsSorter:
         )
         return [(hand[1], hand[2]) for hand in sorted_hands]
 
-def main(input_text: str):
-    hands = parse_hands_list(input_text)
+def parse(input_text: str) -> list[tuple[str, int]]:
+    return parse_hands_list(input_text)
+
+def solve_part_1(hands: list[tuple[str, int]]) -> int:
     sorter = HandsSorter(hands)
     sorted_hands = sorter.sort(hand_cmp_by_first_difference)
-    winnings = sum((i + 1) * hand[1] for i, hand in enumerate(sorted_hands))
-    print(f'Solution part 1: {winnings}')
+    return sum((i + 1) * hand[1] for i, hand in enumerate(sorted_hands))
 
+def solve_part_2(hands: list[tuple[str, int]]) -> int:
     sorter_jokers = HandsSorter(hands, j_is_joker=True)
     sorted_hands_jokers = sorter_jokers.sort(
         partial(hand_cmp_by_first_difference, j_is_lowest=True)
     )
-    winnings_jokers = sum(
+    return sum(
         (i + 1) * hand[1] for i, hand in enumerate(sorted_hands_jokers)
     )
+
+def main(input_text: str):
+    hands = parse(input_text)
+    winnings = solve_part_1(hands)
+    print(f'Solution part 1: {winnings}')
+
+    winnings_jokers = solve_part_2(hands)
     print(f'Solution part 2: {winnings_jokers}')
 
 if __name__ == "__main__":
@@ -201,13 +201,22 @@ class Network:
             end_nodes_indexes=end_nodes_indexes
         )
 
+def parse(input_text: str) -> Network:
+    return Network.from_string(input_text)
+
+def solve_part_1(network: Network) -> int:
+    return network.travel(start_node_id='AAA', end_node_id='ZZZ')
+
+def solve_part_2(network: Network) -> int:
+    # return network.ghost_travel('A', 'Z')
+    return network.ghost_travel_with_LCM('A', 'Z')
+
 def main(input_text: str):
-    network = Network.from_string(input_text)
-    steps = network.travel(start_node_id='AAA', end_node_id='ZZZ')
+    network = parse(input_text)
+    steps = solve_part_1(network)
     print(f'Solution part 1: {steps=}')
 
-    # ghost_steps = network.ghost_travel('A', 'Z')
-    ghost_steps = network.ghost_travel_with_LCM('A', 'Z')
+    ghost_steps = solve_part_2(network)
     print(f'Solution part 2: {ghost_steps=}')
 
 if __name__ == "__main__":
@@ -46,15 +46,24 @@ class History:
         return History(values=sub_history_values)
 
 
-def main(input_text: str):
-    histories = [
+def parse(input_text: str) -> list[History]:
+    return [
         History.from_string(line) for line in input_text.splitlines()
     ]
+
+def solve_part_1(histories: list[History]) -> int:
     next_values = [history.calculate_next_value() for history in histories]
-    print(f'Solution part 1: {sum(next_values)=}')
+    return sum(next_values)
 
+def solve_part_2(histories: list[History]) -> int:
     previous_values = [history.calculate_previous_value() for history in histories]
-    print(f'Solution part 2: {sum(previous_values)=}')
+    return sum(previous_values)
+
+def main(input_text: str):
+    histories = parse(input_text)
+    print(f'Solution part 1: sum(next_values)={solve_part_1(histories)}')
+
+    print(f'Solution part 2: sum(previous_values)={solve_part_2(histories)}')
 
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read()
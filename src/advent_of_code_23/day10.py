@@ -208,13 +208,25 @@ def find_enclosed_tiles(board: Board) -> set[complex]:
 
     return possible_enclosed_tiles[0] & possible_enclosed_tiles[1]
 
+def parse(input_text: str) -> Board:
+    return Board.from_string(input_text)
+
+def solve_part_1(board: Board) -> int:
+    _, farthest_distance = board.get_farthest_point()
+    return farthest_distance
+
+def solve_part_2(board: Board) -> int:
+    enclosed_tiles = find_enclosed_tiles(board)
+    return len(enclosed_tiles)
+
 def main(input_text: str):
-    board = Board.from_string(input_text)
-    farthest = board.get_farthest_point()
+    board = parse(input_text)
+    farthest_point, _ = board.get_farthest_point()
+    farthest = (farthest_point, solve_part_1(board))
     print(f'Solution part 1: {farthest}')
 
-    enclosed_tiles = find_enclosed_tiles(board)
-    print(f'Solution part 2: {len(enclosed_tiles)}')
+    enclosed_tiles_count = solve_part_2(board)
+    print(f'Solution part 2: {enclosed_tiles_count}')
 
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read()
@@ -5,65 +5,61 @@
 
 import itertools
 import sys
-from dataclasses import dataclass
 from typing import Self
 
+import numpy as np
+
+from advent_of_code_23.grid import Grid
+
 GALAXY = '#'
 VOID = '.'
 
-@dataclass
 class Image:
-    galaxies: set[complex]
-    height: int
-    width: int
+
+    def __init__(
+        self, rows: np.ndarray, cols: np.ndarray, height: int, width: int
+    ) -> None:
+        self.rows = rows.astype(np.int64, copy=False)
+        self.cols = cols.astype(np.int64, copy=False)
+        self.height = height
+        self.width = width
 
     @classmethod
     def from_string(cls, text: str) -> Self:
-        text_lines = text.strip().splitlines()
-        height = len(text_lines)
-        width = len(text_lines[0])
+        return cls.from_grid(Grid.from_string(text))
 
-        galaxies = set()
-
-        for row, line in enumerate(text_lines):
-            for col, tile in enumerate(line):
-                if tile == GALAXY:
-                    galaxies.add(col + row*1j)
-
-        return cls(galaxies=galaxies, height=height, width=width)
+    @classmethod
+    def from_grid(cls, grid: Grid) -> Self:
+        rows, cols = np.nonzero(grid.mask(GALAXY))
+        return cls(rows=rows, cols=cols, height=grid.height, width=grid.width)
+
+    @property
+    def galaxies(self) -> set[complex]:
+        return {
+            complex(col, row)
+            for row, col in zip(self.rows.tolist(), self.cols.tolist())
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Image):
+            return NotImplemented
+        return (
+            (self.height, self.width) == (other.height, other.width) and
+            self.galaxies == other.galaxies
+        )
 
     def expand_space(self, rate: int = 2) -> Self:
-        height = self.height
-        width = self.width
-        galaxies_movements = {galaxy: galaxy for galaxy in self.galaxies}
-
-        # Rows expansion
-        for row in range(self.height):
-            if any(
-                (col + 1j*row) in self.galaxies
-                for col in range(self.height)
-            ):
-                continue
-            height += (rate - 1)
-            for galaxy in galaxies_movements:
-                if galaxy.imag > row:
-                    galaxies_movements[galaxy] += (rate - 1)*1j
-        # Columns expansion
-        for col in range(self.width):
-            if any(
-                (col + 1j*row) in self.galaxies
-                for row in range(self.width)
-            ):
-                continue
-            width += rate - 1
-            for galaxy in galaxies_movements:
-                if galaxy.real > col:
-                    galaxies_movements[galaxy] += (rate - 1)
+        # Every empty row (column) before a galaxy pushes it `rate - 1` away
+        empty_rows = np.ones(self.height, dtype=np.int64)
+        empty_rows[self.rows] = 0
+        empty_cols = np.ones(self.width, dtype=np.int64)
+        empty_cols[self.cols] = 0
 
         return Image(
-            galaxies=set(galaxies_movements.values()),
-            height=height,
-            width=width
+            rows=self.rows + np.cumsum(empty_rows)[self.rows] * (rate - 1),
+            cols=self.cols + np.cumsum(empty_cols)[self.cols] * (rate - 1),
+            height=self.height + int(empty_rows.sum()) * (rate - 1),
+            width=self.width + int(empty_cols.sum()) * (rate - 1)
         )
 
     def calculate_galaxy_paths_lengths(self) -> list[int]:
@@ -74,19 +70,36 @@ class Image:
             for galaxy_pair in galaxy_pairs
         ]
 
+    def total_paths_length(self) -> int:
+        '''Sum of the lengths of the paths between every pair of galaxies'''
+        total = 0
+        for coords in (self.rows, self.cols):
+            # The i-th smallest is after i galaxies and before n - 1 - i
+            ordered = np.sort(coords)
+            weights = 2 * np.arange(len(ordered), dtype=np.int64) - len(ordered) + 1
+            total += int(ordered @ weights)
+        return total
+
 def distance_between_galaxies(galaxy_a: complex, galaxy_b: complex) -> int:
     return int(
         abs(galaxy_a.imag - galaxy_b.imag) + abs(galaxy_a.real - galaxy_b.real)
     )
 
+def parse(input_text: str) -> Image:
+    return Image.from_string(input_text)
+
+def solve_part_1(image: Image) -> int:
+    return image.expand_space().total_paths_length()
+
+def solve_part_2(image: Image) -> int:
+    return image.expand_space(1_000_000).total_paths_length()
+
 def main(input_text: str):
-    image = Image.from_string(input_text)
-    expanded_image = image.expand_space()
-    sum_paths = sum(expanded_image.calculate_galaxy_paths_lengths())
+    image = parse(input_text)
+    sum_paths = solve_part_1(image)
     print(f'Solution part 1: {sum_paths}')
 
-    super_expanded_image = image.expand_space(1_000_000)
-    sum_super_paths = sum(super_expanded_image.calculate_galaxy_paths_lengths())
+    sum_super_paths = solve_part_2(image)
     print(f'Solution part 2: {sum_super_paths}')
 
 if __name__ == "__main__":
@@ -4,118 +4,255 @@
 # pylint: disable=missing-class-docstring
 
 import sys
-from functools import cache
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import update_wrapper
+from typing import Any, Callable, Hashable, Iterator
 
 OPERATIONAL = '.'
 DAMAGED = '#'
 UNKNOWN = '?'
 
+# Separates the positional and the keyword arguments in the cache keys
+_KWARGS_MARK = object()
+
+def close_springs(
+    configuration: str
+) -> tuple[str, Callable[[int, int], bool]]:
+    """Configuration closed by an operational spring, and a check of whether
+    a group of damaged springs fits at a cursor of it"""
+    # A trailing operational spring closes a group ending at the last one
+    padded = configuration + OPERATIONAL
+    length = len(padded)
+
+    operational_before = [0] * (length + 1)
+    for cursor, spring in enumerate(padded):
+        operational_before[cursor + 1] = (
+            operational_before[cursor] + (spring == OPERATIONAL)
+        )
+
+    def fits(cursor: int, block_length: int) -> bool:
+        end = cursor + block_length
+        return (
+            end < length and
+            operational_before[end] == operational_before[cursor] and
+            padded[end] != DAMAGED
+        )
+
+    return padded, fits
+
 def find_arrangements(
+    configuration: str, damaged_to_find: tuple[int, ...]
+) -> set[str]:
+    return set(iter_arrangements(configuration, damaged_to_find))
+
+def iter_arrangements(
     configuration: str,
     damaged_to_find: tuple[int, ...],
-    cursor: int = 0,
-    damaged_cursor: int = 0
-) -> set[str]:
+    limit: int | None = None
+) -> Iterator[str]:
+    """Yield every arrangement once, stopping after `limit` of them.
 
-    arrangements = set()
+    A table of which (position, group) states can still be completed is
+    built first, so the depth first search never enters a dead end and
+    only one partial arrangement per pending branch is kept in memory.
+    """
+    if limit is not None and limit < 0:
+        raise ValueError(f'Invalid limit {limit}')
 
-    while cursor < len(configuration) and damaged_cursor < len(damaged_to_find):
+    padded, fits = close_springs(configuration)
+    length = len(padded)
+    groups_count = len(damaged_to_find)
 
-        if configuration[cursor] == OPERATIONAL:
-            cursor += 1
+    # completable[group][cursor]: damaged_to_find[group:] fit in padded[cursor:]
+    completable = [[False] * (length + 1) for _ in range(groups_count + 1)]
+    completable[groups_count][length] = True
+    for cursor in range(length - 1, -1, -1):
+        completable[groups_count][cursor] = (
+            padded[cursor] != DAMAGED and completable[groups_count][cursor + 1]
+        )
+    for group in range(groups_count - 1, -1, -1):
+        block_length = damaged_to_find[group]
+        for cursor in range(length - 1, -1, -1):
+            completable[group][cursor] = (
+                padded[cursor] != DAMAGED and completable[group][cursor + 1]
+            ) or (
+                fits(cursor, block_length) and
+                completable[group + 1][cursor + block_length + 1]
+            )
+
+    if not completable[0][0]:
+        return
+
+    yielded = 0
+    pending = [(0, 0, '')]
+    while pending and (limit is None or yielded < limit):
+        cursor, group, prefix = pending.pop()
+
+        if group == groups_count:
+            rest = padded[cursor:].replace(UNKNOWN, OPERATIONAL)
+            yield (prefix + rest)[:len(configuration)]
+            yielded += 1
             continue
 
-        if configuration[cursor] == UNKNOWN:
-            arrangements.update(find_arrangements(
-                configuration[:cursor] + '.' + configuration[cursor + 1:],
-                damaged_to_find,
-                cursor=cursor+1,
-                damaged_cursor=damaged_cursor
+        block_length = damaged_to_find[group]
+        end = cursor + block_length
+        if fits(cursor, block_length) and completable[group + 1][end + 1]:
+            pending.append((
+                end + 1, group + 1, prefix + DAMAGED * block_length + OPERATIONAL
             ))
+        if padded[cursor] != DAMAGED and completable[group][cursor + 1]:
+            pending.append((cursor + 1, group, prefix + OPERATIONAL))
 
-        end = cursor + damaged_to_find[damaged_cursor]
-        if end > len(configuration):
-            break
-        if end < len(configuration) and configuration[end] == DAMAGED:
-            break
-        if OPERATIONAL in configuration[cursor:end]:
-            break
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int | None
 
-        configuration = (
-            configuration[:cursor] +
-            DAMAGED * (end - cursor) +
-            (OPERATIONAL if end < len(configuration) else '') +
-            configuration[end + 1:]
-        )
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
 
-        damaged_cursor += 1
-        cursor = end + 1
-    else:
-        if (
-            damaged_cursor == len(damaged_to_find) and
-            DAMAGED not in configuration[cursor:]
-        ):
-            configuration = (
-                configuration[:cursor] +
-                configuration[cursor:].replace(UNKNOWN, OPERATIONAL)
-            )
-            arrangements.add(configuration)
+class BoundedCache:
+    '''Least recently used cache of the results of a function.
+
+    Keeps at most `max_size` results (`None` for no limit, 0 to disable the
+    cache) and counts hits, misses and evictions.
+    '''
 
-    return arrangements
+    def __init__(
+        self, function: Callable[..., Any], max_size: int | None = 4096
+    ) -> None:
+        if max_size is not None and max_size < 0:
+            raise ValueError(f'Invalid cache size {max_size}')
+        update_wrapper(self, function)
+        self.function = function
+        self.max_size = max_size
+        self.results: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
-@cache
+    def __call__(self, *args: Hashable, **kwargs: Hashable) -> Any:
+        key = args
+        if kwargs:
+            key += (_KWARGS_MARK, *kwargs.items())
+        if key in self.results:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return self.results[key]
+
+        self.misses += 1
+        result = self.function(*args, **kwargs)
+        if self.max_size != 0:
+            self.results[key] = result
+            if self.max_size is not None and len(self.results) > self.max_size:
+                self.results.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def resize(self, max_size: int | None) -> None:
+        if max_size is not None and max_size < 0:
+            raise ValueError(f'Invalid cache size {max_size}')
+        self.max_size = max_size
+        while max_size is not None and len(self.results) > max_size:
+            self.results.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        '''Drop the cached results and reset the counters'''
+        self.results.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self.results),
+            max_size=self.max_size
+        )
+
+def bounded_cache(
+    max_size: int | None = 4096
+) -> Callable[[Callable[..., Any]], BoundedCache]:
+    def decorator(function: Callable[..., Any]) -> BoundedCache:
+        return BoundedCache(function, max_size)
+    return decorator
+
+@bounded_cache()
 def count_arrangements(
     configuration: str, damaged_to_find: tuple[int, ...]
 ) -> int:
-    """Recursively count how many possible configurations are there in"""
-
-    count = 0
-
-    if damaged_to_find:
-        if not configuration:
-            return 0
-    else:
-        if not configuration:
-            return 1
-        return DAMAGED not in configuration
-
-    if configuration[0] in (OPERATIONAL, UNKNOWN):
-        count += count_arrangements(configuration[1:], damaged_to_find)
-
-    if configuration[0] in (DAMAGED, UNKNOWN):
-        block_length = damaged_to_find[0]
-        if block_length > len(configuration):
-            pass
-        elif OPERATIONAL in configuration[:block_length]:
-            pass
-        elif configuration[block_length:][:1] != DAMAGED:
-            count += count_arrangements(
-                configuration[block_length + 1:], damaged_to_find[1:]
-            )
+    """Count the arrangements with dynamic programming over positions.
 
-    return count
+    `ways[cursor]` counts the ways of placing the groups seen so far in
+    `configuration[:cursor]`, with the next group starting at `cursor` or
+    later. Groups are checked in constant time, so it takes O(len x groups).
+    """
+    configuration, fits = close_springs(configuration)
+    length = len(configuration)
 
-def main(input_text: str):
+    # No groups placed: only possible while no damaged spring was skipped
+    ways = [0] * (length + 1)
+    for cursor in range(length + 1):
+        ways[cursor] = 1
+        if cursor < length and configuration[cursor] == DAMAGED:
+            break
+
+    for block_length in damaged_to_find:
+        next_ways = [0] * (length + 1)
+        for cursor in range(length):
+            if configuration[cursor] != DAMAGED:
+                next_ways[cursor + 1] += next_ways[cursor]
 
-    all_arrangements = []
+            if ways[cursor] and fits(cursor, block_length):
+                next_ways[cursor + block_length + 1] += ways[cursor]
+        ways = next_ways
+
+    return ways[length]
+
+def unfold(
+    configuration: str, damaged: tuple[int, ...], factor: int = 5
+) -> tuple[str, tuple[int, ...]]:
+    if factor < 1:
+        raise ValueError(f'Invalid unfold factor {factor}')
+    return UNKNOWN.join([configuration] * factor), damaged * factor
+
+def parse(input_text: str) -> list[tuple[str, tuple[int, ...]]]:
+    records = []
     for line in input_text.strip().splitlines():
         configuration, nums = line.split()
         damaged = tuple(int(num) for num in nums.split(','))
-        arrangements = find_arrangements(configuration, damaged)
-        all_arrangements.append(arrangements)
-    total_arrangements_count = sum(
-        len(arrangements) for arrangements in all_arrangements
+        records.append((configuration, damaged))
+    return records
+
+def solve_part_1(records: list[tuple[str, tuple[int, ...]]]) -> int:
+    return sum(
+        count_arrangements(configuration, damaged)
+        for configuration, damaged in records
+    )
+
+def solve_part_2(records: list[tuple[str, tuple[int, ...]]]) -> int:
+    return sum(
+        count_arrangements(*unfold(configuration, damaged))
+        for configuration, damaged in records
     )
+
+def main(input_text: str):
+
+    records = parse(input_text)
+    total_arrangements_count = solve_part_1(records)
     print(f'Solution part 1: {total_arrangements_count}')
 
-    arrangements_counts = []
-    for line in input_text.strip().splitlines():
-        configuration, nums = line.split()
-        configuration = '?'.join([configuration]*5)
-        damaged = tuple(int(num) for num in nums.split(',')) * 5
-        arrangements_count = count_arrangements(configuration, damaged)
-        arrangements_counts.append(arrangements_count)
-    total_count = sum(arrangements_counts)
+    total_count = solve_part_2(records)
     print(f'Solution part 2: {total_count}')
 
 if __name__ == "__main__":
@@ -111,16 +111,25 @@ def find_horizontal_mirrors(pattern: Pattern, smudges: int = 0) -> int | None:
         if len(bottom.symmetric_difference(top_reflection)) == smudges:
             return row
 
-def main(input_text: str):
+def parse(input_text: str) -> tuple[Pattern, ...]:
     pattern_texts = input_text.strip().split('\n\n')
-    patterns = tuple(Pattern.from_string(text) for text in pattern_texts)
+    return tuple(Pattern.from_string(text) for text in pattern_texts)
+
+def solve_part_1(patterns: tuple[Pattern, ...]) -> int:
     scores = tuple(pattern.calculate_score() for pattern in patterns)
-    print(f'Solution part 1: {sum(scores)}')
+    return sum(scores)
 
+def solve_part_2(patterns: tuple[Pattern, ...]) -> int:
     scores_with_smudges = tuple(
         pattern.calculate_score(1) for pattern in patterns
     )
-    print(f'Solution part 2: {sum(scores_with_smudges)}')
+    return sum(scores_with_smudges)
+
+def main(input_text: str):
+    patterns = parse(input_text)
+    print(f'Solution part 1: {solve_part_1(patterns)}')
+
+    print(f'Solution part 2: {solve_part_2(patterns)}')
 
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read()
@@ -3,138 +3,219 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=missing-class-docstring
 
+import hashlib
 import sys
-from dataclasses import dataclass
+from copy import deepcopy
 from typing import Self
 
+import numpy as np
+
+from advent_of_code_23.grid import Grid, to_coords
+
 ROUND_ROCK = 'O'
 CUBE_ROCK = '#'
 
-@dataclass
+NORTH, WEST, SOUTH, EAST = 'north', 'west', 'south', 'east'
+
+# Set bits of every byte value
+POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+def orient(tiles: np.ndarray, direction: str) -> np.ndarray:
+    '''View of the tiles where tilting to `direction` moves rocks to row 0'''
+    match direction:
+        case 'north':
+            return tiles
+        case 'south':
+            return tiles[::-1]
+        case 'west':
+            return tiles.T
+        case 'east':
+            return tiles.T[::-1]
+    raise ValueError(f'Unknown direction: {direction!r}')
+
+def unorient(tiles: np.ndarray, direction: str) -> np.ndarray:
+    match direction:
+        case 'north':
+            return tiles
+        case 'south':
+            return tiles[::-1]
+        case 'west':
+            return tiles.T
+        case 'east':
+            return tiles[::-1].T
+    raise ValueError(f'Unknown direction: {direction!r}')
+
+def build_tilt_table(
+    cubes: np.ndarray, direction: str
+) -> tuple[np.ndarray, np.ndarray, int]:
+    '''Segment id and rank inside the segment of every tile.
+
+    A segment is a run of tiles between cube rocks (or the border) along the
+    tilting direction, and the rank is the distance to the end of the segment
+    where rocks pile up. After tilting, a segment with `n` round rocks has
+    them at ranks `0..n-1`. Cube rocks get a rank that no count can reach.
+    '''
+    oriented = orient(cubes, direction)
+    length, lanes = oriented.shape
+    positions = np.arange(length, dtype=np.int32)[:, None]
+
+    last_cube = np.maximum.accumulate(
+        np.where(oriented, positions, -1), axis=0
+    )
+    ranks = positions - last_cube - 1
+    ranks[oriented] = np.iinfo(np.int32).max
+    segments = (
+        np.cumsum(oriented, axis=0, dtype=np.int32) +
+        np.arange(lanes, dtype=np.int32)[None, :] * (length + 1)
+    )
+
+    return (
+        np.ascontiguousarray(unorient(segments, direction)).reshape(-1),
+        np.ascontiguousarray(unorient(ranks, direction)).reshape(-1),
+        lanes * (length + 1)
+    )
+
 class Platform:
-    cube_rocks: set[complex]
-    round_rocks: set[complex]
-    height: int
-    width: int
+    '''Platform whose round rocks are stored as packed bits, one row of
+    bytes per platform row (`round_bits`). That is the state cached between
+    tilt cycles, so every cached layout takes `height * width / 8` bytes.
+    '''
+
+    def __init__(self, cubes: np.ndarray, rounds: np.ndarray) -> None:
+        self.cubes = cubes
+        self.height, self.width = cubes.shape
+        self.round_bits = pack_rows(rounds)
+        self._tilt_tables: dict[str, tuple[np.ndarray, np.ndarray, int]] = {}
 
     @classmethod
     def from_string(cls, text: str) -> Self:
-        lines = text.strip().splitlines()
-        height = len(lines)
-        width = len(lines[0])
-
-        cube_rocks, round_rocks = set(), set()
-        for row, line in enumerate(lines):
-            for col, tile in enumerate(line):
-                if tile == CUBE_ROCK:
-                    cube_rocks.add(col + row * 1j)
-                if tile == ROUND_ROCK:
-                    round_rocks.add(col + row * 1j)
-
-        return cls(
-            cube_rocks=cube_rocks,
-            round_rocks=round_rocks,
-            height=height,
-            width=width
+        return cls.from_grid(Grid.from_string(text))
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> Self:
+        return cls(cubes=grid.mask(CUBE_ROCK), rounds=grid.mask(ROUND_ROCK))
+
+    @property
+    def rounds(self) -> np.ndarray:
+        return np.unpackbits(
+            self.round_bits, axis=1, count=self.width
+        ).astype(bool)
+
+    @rounds.setter
+    def rounds(self, rounds: np.ndarray) -> None:
+        self.round_bits = pack_rows(rounds)
+
+    @property
+    def cube_rocks(self) -> set[complex]:
+        return to_coords(self.cubes)
+
+    @property
+    def round_rocks(self) -> set[complex]:
+        return to_coords(self.rounds)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Platform):
+            return NotImplemented
+        return (
+            np.array_equal(self.cubes, other.cubes) and
+            np.array_equal(self.round_bits, other.round_bits)
         )
 
+    def tilt(self, direction: str) -> None:
+        self.rounds = self._tilt_rounds(self.rounds, direction)
+
+    def _tilt_rounds(self, rounds: np.ndarray, direction: str) -> np.ndarray:
+        if direction not in self._tilt_tables:
+            self._tilt_tables[direction] = build_tilt_table(
+                self.cubes, direction
+            )
+        segments, ranks, segments_count = self._tilt_tables[direction]
+
+        rocks_per_segment = np.bincount(
+            segments[rounds.reshape(-1)], minlength=segments_count
+        )
+        return (
+            ranks < np.take(rocks_per_segment, segments)
+        ).reshape(self.height, self.width)
+
     def tilt_north(self) -> None:
-        new_round_rocks = set()
-        for col in range(self.width):
-            base = -1
-            for row in range(self.height):
-                if col + row*1j in self.cube_rocks:
-                    base = row
-                elif col + row*1j in self.round_rocks:
-                    base += 1
-                    new_round_rocks.add(col + base*1j)
-        self.round_rocks = new_round_rocks
+        self.tilt(NORTH)
 
     def tilt_south(self) -> None:
-        new_round_rocks = set()
-        for col in range(self.width):
-            base = self.height
-            for row in range(self.height - 1, -1, -1):
-                if col + row*1j in self.cube_rocks:
-                    base = row
-                elif col + row*1j in self.round_rocks:
-                    base -= 1
-                    new_round_rocks.add(col + base*1j)
-        self.round_rocks = new_round_rocks
+        self.tilt(SOUTH)
 
     def tilt_west(self) -> None:
-        new_round_rocks = set()
-        for row in range(self.height):
-            base = -1
-            for col in range(self.width):
-                if col + row*1j in self.cube_rocks:
-                    base = col
-                elif col + row*1j in self.round_rocks:
-                    base += 1
-                    new_round_rocks.add(base + row*1j)
-        self.round_rocks = new_round_rocks
+        self.tilt(WEST)
 
     def tilt_east(self) -> None:
-        new_round_rocks = set()
-        for row in range(self.height):
-            base = self.width
-            for col in range(self.width - 1, -1, -1):
-                if col + row*1j in self.cube_rocks:
-                    base = col
-                elif col + row*1j in self.round_rocks:
-                    base -= 1
-                    new_round_rocks.add(base + row*1j)
-        self.round_rocks = new_round_rocks
+        self.tilt(EAST)
 
     def tilt_cycle(self) -> None:
-        self.tilt_north()
-        self.tilt_west()
-        self.tilt_south()
-        self.tilt_east()
+        # Unpacked only once for the four tilts
+        rounds = self.rounds
+        for direction in (NORTH, WEST, SOUTH, EAST):
+            rounds = self._tilt_rounds(rounds, direction)
+        self.rounds = rounds
 
     def tilt_multiple_cycles(self, cycles: int) -> None:
-        cache = {self._calculate_cache_key(): 0}
+        # Packed states indexed by iteration, and the iteration of every state
+        # by its 64 bit digest, so a loop is found and resolved in O(1)
+        states = [self._calculate_cache_key()]
+        iterations = {state_digest(states[0]): 0}
 
         for iteration in range(1, cycles+1):
             self.tilt_cycle()
-            current_key = self._calculate_cache_key()
+            current_state = self._calculate_cache_key()
+            current_digest = state_digest(current_state)
 
-            if current_key in cache:
-                loop_start = cache[current_key]
+            loop_start = iterations.get(current_digest)
+            if loop_start is not None and states[loop_start] == current_state:
                 loop_length = iteration - loop_start
                 offset = (cycles - loop_start) % loop_length
+                self._restore_cache_key(states[loop_start + offset])
+                return
 
-                for rocks, cached_iteration in cache.items():
-                    if cached_iteration == loop_start + offset:
-                        self.round_rocks = set(rocks)
-                        return
-                raise ValueError(
-                    f'Cache error: Iteration {loop_start + offset} not found.'
-                )
+            iterations[current_digest] = iteration
+            states.append(current_state)
 
-            cache[current_key] = iteration
+    def _calculate_cache_key(self) -> bytes:
+        return self.round_bits.tobytes()
 
-    def _calculate_cache_key(self) -> tuple[complex, ...]:
-        return tuple(sorted(
-            self.round_rocks,
-            key=lambda rock: (rock.imag, rock.real)
-        ))
+    def _restore_cache_key(self, key: bytes) -> None:
+        self.round_bits = np.frombuffer(key, dtype=np.uint8).reshape(
+            self.height, -1
+        ).copy()
 
     @property
     def north_load(self) -> int:
-        return sum(
-            int(self.height - rock.imag)
-            for rock in self.round_rocks
-        )
+        rocks_per_row = POPCOUNT[self.round_bits].sum(axis=1, dtype=np.int64)
+        row_loads = np.arange(self.height, 0, -1)
+        return int(rocks_per_row @ row_loads)
 
-def main(input_text: str):
-    platform = Platform.from_string(input_text)
+def pack_rows(rounds: np.ndarray) -> np.ndarray:
+    return np.packbits(rounds, axis=1)
+
+def state_digest(state: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(state, digest_size=8).digest())
+
+def parse(input_text: str) -> Platform:
+    return Platform.from_string(input_text)
+
+def solve_part_1(platform: Platform) -> int:
+    platform = deepcopy(platform)
     platform.tilt_north()
-    print(f'Solution part 1: {platform.north_load}')
+    return platform.north_load
+
+def solve_part_2(platform: Platform) -> int:
+    platform = deepcopy(platform)
+    platform.tilt_multiple_cycles(1_000_000_000)
+    return platform.north_load
+
+def main(input_text: str):
+    platform = parse(input_text)
+    print(f'Solution part 1: {solve_part_1(platform)}')
 
-    second_platform = Platform.from_string(input_text)
-    second_platform.tilt_multiple_cycles(1_000_000_000)
-    print(f'Solution part 2: {second_platform.north_load}')
+    print(f'Solution part 2: {solve_part_2(platform)}')
 
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read()
@@ -78,18 +78,27 @@ def hash_text(text: str) -> int:
 
     return value
 
-def main(input_text: str):
-    sequence_steps = input_text.strip().replace('\n', '').split(',')
+def parse(input_text: str) -> list[str]:
+    return input_text.strip().replace('\n', '').split(',')
+
+def solve_part_1(sequence_steps: list[str]) -> int:
     hashes = [hash_text(step) for step in sequence_steps]
-    print(f'Solution part 1: {sum(hashes)}')
+    return sum(hashes)
 
+def solve_part_2(sequence_steps: list[str]) -> int:
     box_array = BoxArray()
     for step in sequence_steps:
         box_array.process_step(step)
-    total_focusing_power = sum(
+    return sum(
         sum(box.focusing_powers)
         for box in box_array.boxes.values()
     )
+
+def main(input_text: str):
+    sequence_steps = parse(input_text)
+    print(f'Solution part 1: {solve_part_1(sequence_steps)}')
+
+    total_focusing_power = solve_part_2(sequence_steps)
     print(f'Solution part 2: {total_focusing_power}')
 
 if __name__ == "__main__":
@@ -3,9 +3,18 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=missing-class-docstring
 
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from enum import Enum
-from typing import Self
+from functools import cached_property
+from typing import Iterable, Self
+
+import numpy as np
+
+from advent_of_code_23.grid import Grid, to_coords
 
 class Direction(complex, Enum):
     UP = -1j
@@ -44,34 +53,158 @@ def next_directions(
         case _:
             return (current,)
 
+DIRECTIONS = tuple(Direction)
+STEPS = tuple((int(direction.real), int(direction.imag)) for direction in DIRECTIONS)
+
+# Indices of the next directions, by tile type and index of the direction
+NEXT_DIRECTIONS = {
+    tile_type: tuple(
+        tuple(DIRECTIONS.index(following) for following in next_directions(
+            direction, tile_type
+        )) for direction in DIRECTIONS
+    ) for tile_type in '.|-/\\'
+}
+SPLIT_DIRECTIONS = {
+    '|': (DIRECTIONS.index(Direction.UP), DIRECTIONS.index(Direction.DOWN)),
+    '-': (DIRECTIONS.index(Direction.RIGHT), DIRECTIONS.index(Direction.LEFT)),
+}
+
+def strongly_connected_components(
+    successors: dict[int, list[int]]
+) -> list[list[int]]:
+    '''Tarjan's algorithm, without recursion.
+
+    Components are returned in reverse topological order: each one comes
+    after every component reachable from it.
+    '''
+    order: dict[int, int] = {}
+    lowlink: dict[int, int] = {}
+    stack: list[int] = []
+    on_stack: set[int] = set()
+    components = []
+
+    for root in successors:
+        if root in order:
+            continue
+
+        order[root] = lowlink[root] = len(order)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors[root]))]
+
+        while work:
+            node, children = work[-1]
+
+            for child in children:
+                if child not in order:
+                    order[child] = lowlink[child] = len(order)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors[child])))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], order[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
+
 class Contraption:
 
-    def __init__(
-        self, mirrors: dict[complex, str], height: int, width: int
-    ) -> None:
+    def __init__(self, grid: Grid) -> None:
 
-        self.mirrors = mirrors
-        self.height = height
-        self.width = width
+        self.grid = grid
+        self.height = grid.height
+        self.width = grid.width
 
         self.energized_tiles: set[complex] = set()
 
+        self._jumps: np.ndarray | None = None
+
     @classmethod
     def from_string(cls, text: str) -> Self:
+        return cls(Grid.from_string(text))
 
-        lines = text.strip().splitlines()
+    @cached_property
+    def mirrors(self) -> dict[complex, str]:
+        return {
+            coords: self.grid[coords]
+            for coords in to_coords(self.grid.tiles != ord('.'))
+        }
 
-        height = len(lines)
-        width = len(lines[0])
+    @cached_property
+    def tiles(self) -> str:
+        '''Tile types by flat index (`row * width + col`)'''
+        return self.grid.flat.tobytes().decode('ascii')
 
-        mirrors = {}
-
-        for row, line in enumerate(lines):
-            for col, tile in enumerate(line):
-                if tile != '.':
-                    mirrors[col + row * 1j] = tile
-
-        return cls(mirrors=mirrors, width=width, height=height)
+    @property
+    def jumps(self) -> np.ndarray:
+        '''Where a beam stops going straight, by direction index and tile.
+
+        `jumps[direction, index]` is the flat index of the first mirror,
+        splitter or border tile found from tile `index` (itself included)
+        going in that direction, so beams can cross empty space in one jump.
+        '''
+        if self._jumps is None:
+            height, width = self.height, self.width
+            rows, cols = np.indices((height, width))
+            stops = self.grid.tiles != ord('.')
+
+            jumps = np.empty((len(DIRECTIONS), height * width), dtype=np.int64)
+            for direction_index, direction in enumerate(DIRECTIONS):
+                match direction:
+                    case Direction.UP:
+                        marks = np.where(stops | (rows == 0), rows, -1)
+                        stop_rows = np.maximum.accumulate(marks, axis=0)
+                        stop_cols = cols
+                    case Direction.DOWN:
+                        marks = np.where(stops | (rows == height - 1), rows, height)
+                        stop_rows = np.minimum.accumulate(marks[::-1], axis=0)[::-1]
+                        stop_cols = cols
+                    case Direction.LEFT:
+                        marks = np.where(stops | (cols == 0), cols, -1)
+                        stop_cols = np.maximum.accumulate(marks, axis=1)
+                        stop_rows = rows
+                    case Direction.RIGHT:
+                        marks = np.where(stops | (cols == width - 1), cols, width)
+                        stop_cols = np.minimum.accumulate(marks[:, ::-1], axis=1)[:, ::-1]
+                        stop_rows = rows
+                jumps[direction_index] = (stop_rows * width + stop_cols).reshape(-1)
+            self._jumps = jumps
+        return self._jumps
+
+    def beam_span(self, index: int, direction: int) -> tuple[slice, int]:
+        '''Tiles crossed going straight from a tile until the beam stops.
+
+        Returns them as a slice of the flat tiles, and the tile where it stops.
+        '''
+        stop = int(self.jumps[direction, index])
+        step_col, step_row = STEPS[direction]
+        step = abs(step_col + step_row * self.width)
+        return slice(min(index, stop), max(index, stop) + 1, step), stop
+
+    def next_tile(self, index: int, direction: int) -> int | None:
+        '''Flat index of the neighbour tile, None if out of the contraption'''
+        row, col = divmod(index, self.width)
+        step_col, step_row = STEPS[direction]
+        col += step_col
+        row += step_row
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return row * self.width + col
+        return None
 
     def put_light_beam(
         self, coords: complex,
@@ -82,72 +215,288 @@ class Contraption:
         if already_processed is None:
             already_processed = set()
 
-        if (coords, direction) in already_processed:
-            return
-
-        already_processed.add((coords, direction))
-
-        if not 0 <= coords.real < self.width:
-            return
-        if not 0 <= coords.imag < self.height:
-            return
+        pending = [(coords, direction)]
 
-        self.energized_tiles.add(coords)
-
-        tile_type = self.mirrors.get(coords, '.')
+        while pending:
+            coords, direction = pending.pop()
+
+            if (coords, direction) in already_processed:
+                continue
+
+            already_processed.add((coords, direction))
+
+            if not 0 <= coords.real < self.width:
+                continue
+            if not 0 <= coords.imag < self.height:
+                continue
+
+            self.energized_tiles.add(coords)
+
+            tile_type = self.mirrors.get(coords, '.')
+
+            for next_direction in next_directions(direction, tile_type):
+                pending.append((coords + next_direction, next_direction))
+
+    def trace(self, coords: complex, direction: Direction) -> int:
+        '''Number of tiles energized by a beam, leaving the contraption as is'''
+        tiles = self.tiles
+
+        energized = np.zeros(self.width * self.height, dtype=bool)
+        seen = set()
+        pending = [(
+            int(coords.imag) * self.width + int(coords.real),
+            DIRECTIONS.index(direction)
+        )]
+
+        while pending:
+            index, direction_index = pending.pop()
+            span, stop = self.beam_span(index, direction_index)
+            energized[span] = True
+
+            state = stop * 4 + direction_index
+            if state in seen:
+                continue
+            seen.add(state)
+
+            for following in NEXT_DIRECTIONS[tiles[stop]][direction_index]:
+                next_index = self.next_tile(stop, following)
+                if next_index is not None:
+                    pending.append((next_index, following))
+
+        return int(np.count_nonzero(energized))
+
+    def trace_segment(
+        self, col: int, row: int, direction: int
+    ) -> tuple[np.ndarray, int | None]:
+        '''Follow a beam until it leaves the contraption, loops or is split.
+
+        `direction` is an index of `DIRECTIONS`. Returns the flat indices of
+        the crossed tiles and the flat index of the splitter that splits the
+        beam, if any.
+        '''
+        if not (0 <= col < self.width and 0 <= row < self.height):
+            return np.empty(0, dtype=np.intp), None
+
+        tiles = self.tiles
+        index = row * self.width + col
+        spans = []
+        seen = set()
+        hit = None
+
+        while True:
+            span, stop = self.beam_span(index, direction)
+            spans.append(np.arange(span.start, span.stop, span.step))
+
+            state = stop * 4 + direction
+            if state in seen:
+                break
+            seen.add(state)
+
+            following = NEXT_DIRECTIONS[tiles[stop]][direction]
+            if len(following) == 2:
+                hit = stop
+                break
+
+            direction = following[0]
+            index = self.next_tile(stop, direction)
+            if index is None:
+                break
+
+        return np.concatenate(spans), hit
+
+    def trace_splits(
+        self, splitters: Iterable[int]
+    ) -> dict[int, list[tuple[np.ndarray, int | None]]]:
+        '''Segments of the two beams of every splitter reachable from these'''
+        splits: dict[int, list[tuple[np.ndarray, int | None]]] = {}
+        pending = list(splitters)
+
+        while pending:
+            splitter = pending.pop()
+            if splitter in splits:
+                continue
+
+            row, col = divmod(splitter, self.width)
+            segments = []
+            for direction in SPLIT_DIRECTIONS[self.tiles[splitter]]:
+                step_col, step_row = STEPS[direction]
+                segments.append(
+                    self.trace_segment(col + step_col, row + step_row, direction)
+                )
+            splits[splitter] = segments
+
+            pending.extend(
+                hit for _, hit in segments
+                if hit is not None and hit not in splits
+            )
+
+        return splits
+
+    def energized_counts(
+        self, starts: Iterable[tuple[complex, Direction]]
+    ) -> list[int]:
+        '''Number of tiles energized by a beam from each of the starts,
+        sharing the masks of the splitter components between them'''
+        start_segments = [
+            self.trace_segment(
+                int(coords.real), int(coords.imag), DIRECTIONS.index(direction)
+            ) for coords, direction in starts
+        ]
+
+        splits = self.trace_splits(
+            hit for _, hit in start_segments if hit is not None
+        )
+        components = strongly_connected_components({
+            splitter: [hit for _, hit in segments if hit is not None]
+            for splitter, segments in splits.items()
+        })
+
+        component_of = {
+            splitter: component_id
+            for component_id, component in enumerate(components)
+            for splitter in component
+        }
+
+        downstream: list[set[int]] = []
+        users = [0] * len(components)
+        for component_id, component in enumerate(components):
+            next_components = {
+                component_of[hit]
+                for splitter in component
+                for _, hit in splits[splitter] if hit is not None
+            }
+            next_components.discard(component_id)
+            for next_component in next_components:
+                users[next_component] += 1
+            downstream.append(next_components)
+
+        counts = [0] * len(start_segments)
+        starts_by_component: dict[int, list[int]] = {}
+        for start, (crossed, hit) in enumerate(start_segments):
+            if hit is None:
+                counts[start] = len(np.unique(crossed))
+            else:
+                starts_by_component.setdefault(
+                    component_of[hit], []
+                ).append(start)
+
+        masks: dict[int, np.ndarray] = {}
+        for component_id, component in enumerate(components):
+
+            mask = None
+            for next_component in sorted(
+                downstream[component_id], key=users.__getitem__
+            ):
+                users[next_component] -= 1
+                if users[next_component] == 0:
+                    next_mask = masks.pop(next_component)
+                    if mask is None:
+                        mask = next_mask
+                        continue
+                else:
+                    next_mask = masks[next_component]
 
-        for next_direction in next_directions(direction, tile_type):
-            next_coords = coords + next_direction
-            self.put_light_beam(next_coords, next_direction, already_processed)
+                if mask is None:
+                    mask = next_mask.copy()
+                else:
+                    mask |= next_mask
+
+            if mask is None:
+                mask = np.zeros(self.width * self.height, dtype=bool)
+
+            mask[component] = True
+            for splitter in component:
+                for crossed, _ in splits.pop(splitter):
+                    mask[crossed] = True
+
+            if component_id in starts_by_component:
+                energized = int(np.count_nonzero(mask))
+                for start in starts_by_component.pop(component_id):
+                    crossed = start_segments[start][0]
+                    counts[start] = energized + int(
+                        np.count_nonzero(~mask[np.unique(crossed)])
+                    )
+
+            if users[component_id]:
+                masks[component_id] = mask
+
+        return counts
+
+    def edge_starts(self) -> list[tuple[complex, Direction]]:
+        '''Every tile of the border, with the direction that enters the grid'''
+        return [
+            *((col, Direction.DOWN) for col in range(self.width)),
+            *(
+                (col + (self.height - 1) * 1j, Direction.UP)
+                for col in range(self.width)
+            ),
+            *((row * 1j, Direction.RIGHT) for row in range(self.height)),
+            *(
+                ((self.width - 1) + row * 1j, Direction.LEFT)
+                for row in range(self.height)
+            ),
+        ]
 
     def get_best_beam(self) -> tuple[complex, Direction, int]:
 
-        cached_energized = self.energized_tiles
-
         current_best_start_tile = 0
         current_best_start_direction = Direction.RIGHT
         current_max = 0
 
-        for col in range(self.width):
-            self.energized_tiles = set()
-            tile = col
-            self.put_light_beam(tile, Direction.DOWN)
-            if len(self.energized_tiles) > current_max:
+        starts = self.edge_starts()
+        for (tile, direction), energized in zip(
+            starts, self.energized_counts(starts)
+        ):
+            if energized > current_max:
                 current_best_start_tile = tile
-                current_best_start_direction = Direction.DOWN
-                current_max = len(self.energized_tiles)
-
-        for col in range(self.width):
-            self.energized_tiles = set()
-            tile = col + (self.height - 1)*1j
-            self.put_light_beam(tile, Direction.UP)
-            if len(self.energized_tiles) > current_max:
-                current_best_start_tile = tile
-                current_best_start_direction = Direction.UP
-                current_max = len(self.energized_tiles)
+                current_best_start_direction = direction
+                current_max = energized
 
-        for row in range(self.height):
-            self.energized_tiles = set()
-            tile = row * 1j
-            self.put_light_beam(tile, Direction.RIGHT)
-            if len(self.energized_tiles) > current_max:
-                current_best_start_tile = tile
-                current_best_start_direction = Direction.RIGHT
-                current_max = len(self.energized_tiles)
+        return (
+            current_best_start_tile, current_best_start_direction, current_max
+        )
 
-        for row in range(self.height):
-            self.energized_tiles = set()
-            tile = (self.width - 1) + row * 1j
-            self.put_light_beam(tile, Direction.LEFT)
-            if len(self.energized_tiles) > current_max:
+    def get_best_beam_parallel(
+        self, workers: int | None = None, chunk_size: int = 16
+    ) -> tuple[tuple[complex, Direction, int], list['WorkerThroughput']]:
+        '''Trace every edge start on its own in a pool of processes.
+
+        The contraption is sent once to each worker. Besides the best beam,
+        returns how many starts each worker traced and how fast.
+        '''
+        starts = self.edge_starts()
+        chunks = [
+            starts[first:first + chunk_size]
+            for first in range(0, len(starts), chunk_size)
+        ]
+
+        counts: list[int] = []
+        throughputs: dict[int, WorkerThroughput] = {}
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(self,)
+        ) as pool:
+            for pid, chunk_counts, elapsed in pool.map(_trace_chunk, chunks):
+                counts.extend(chunk_counts)
+                throughput = throughputs.setdefault(pid, WorkerThroughput(pid))
+                throughput.starts += len(chunk_counts)
+                throughput.seconds += elapsed
+
+        current_best_start_tile = 0
+        current_best_start_direction = Direction.RIGHT
+        current_max = 0
+
+        for (tile, direction), energized in zip(starts, counts):
+            if energized > current_max:
                 current_best_start_tile = tile
-                current_best_start_direction = Direction.LEFT
-                current_max = len(self.energized_tiles)
+                current_best_start_direction = direction
+                current_max = energized
 
-        self.energized_tiles = cached_energized
-        return (
+        best = (
             current_best_start_tile, current_best_start_direction, current_max
         )
+        return best, list(throughputs.values())
 
     @property
     def energized_drawing(self) -> str:
@@ -161,14 +510,47 @@ class Contraption:
             text += '\n'
         return text
 
-def main(input_text: str):
-    contraption = Contraption.from_string(input_text)
-    sys.setrecursionlimit((contraption.width + 2) * (contraption.height + 2))
-    contraption.put_light_beam(0, Direction.RIGHT)
-    print(f'Solution part 1: {len(contraption.energized_tiles)}')
+@dataclass
+class WorkerThroughput:
+    pid: int
+    starts: int = 0
+    seconds: float = 0.0
 
+    @property
+    def starts_per_second(self) -> float:
+        return self.starts / self.seconds if self.seconds else 0.0
+
+_WORKER_CONTRAPTION: Contraption | None = None
+
+def _init_worker(contraption: Contraption) -> None:
+    global _WORKER_CONTRAPTION # pylint: disable=global-statement
+    _WORKER_CONTRAPTION = contraption
+
+def _trace_chunk(
+    starts: list[tuple[complex, Direction]]
+) -> tuple[int, list[int], float]:
+    start_time = time.perf_counter()
+    counts = [
+        _WORKER_CONTRAPTION.trace(coords, direction)
+        for coords, direction in starts
+    ]
+    return os.getpid(), counts, time.perf_counter() - start_time
+
+def parse(input_text: str) -> Contraption:
+    return Contraption.from_string(input_text)
+
+def solve_part_1(contraption: Contraption) -> int:
+    return contraption.trace(0, Direction.RIGHT)
+
+def solve_part_2(contraption: Contraption) -> int:
     *_, best = contraption.get_best_beam()
-    print(f'Solution part 2: {best}')
+    return best
+
+def main(input_text: str):
+    contraption = parse(input_text)
+    print(f'Solution part 1: {solve_part_1(contraption)}')
+
+    print(f'Solution part 2: {solve_part_2(contraption)}')
 
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read()
@@ -3,203 +3,376 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=missing-class-docstring
 
-import heapq
 import sys
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
 from typing import Self
 
+from advent_of_code_23.grid import Grid
+
 class Direction(complex, Enum):
     UP = -1j
     DOWN = 1j
     RIGHT = 1
     LEFT = -1
 
+DIRECTIONS = tuple(Direction)
+STEPS = tuple((int(direction.real), int(direction.imag)) for direction in DIRECTIONS)
+
+VERTICAL, HORIZONTAL = AXES = (0, 1)
+AXIS_OF = tuple(
+    VERTICAL if direction.real == 0 else HORIZONTAL for direction in DIRECTIONS
+)
+# Directions (indices) that turn 90 degrees from each axis
+TURNS = tuple(
+    tuple(
+        index for index, direction_axis in enumerate(AXIS_OF)
+        if direction_axis != axis
+    ) for axis in AXES
+)
+
 class CityMap:
 
-    def __init__(
-        self, blocks: dict[complex, int], width: int, height: int
-    ) -> None:
-        self.blocks = blocks
-        self.width = width
-        self.height = height
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
+        self.width = grid.width
+        self.height = grid.height
+
+        self._lower_bounds: dict[int, array] = {}
 
     @classmethod
     def from_string(cls, text: str) -> Self:
-        lines = text.strip().splitlines()
-
-        height = len(lines)
-        width = len(lines[0])
-
-        blocks = {}
-        for row, line in enumerate(lines):
-            for col, block in enumerate(line):
-                blocks[col + row*1j] = int(block)
-
-        return cls(blocks=blocks, width=width, height=height)
-
-    def find_best_path(
-        self, start: complex, end: complex
-    ) -> tuple[int, list[Direction]]:
-
-        # Dijkstra's Algorithm
-        done: dict[
-            tuple[complex, tuple[Direction, ...]],
-            tuple[int, list[Direction]]
-        ] = {}
-        min_heap = []
-        insertion_order = 0 # To sort equal heat elements in heap
-
-        heapq.heappush(min_heap, (0, insertion_order, start, tuple()))
-        while min_heap:
-            lost_heat, _, coords, previous_directions = heapq.heappop(min_heap)
-
-            if (coords, previous_directions[-3:]) in done:
-                continue
-
-            done[coords, previous_directions[-3:]] = lost_heat, previous_directions
-
-            if coords == end:
-                break
-
-            for direction in self.find_allowed_directions(
-                coords, previous_directions
-            ):
-                neighbour_previous_directions = (*previous_directions, direction)
-                neighbour = coords + direction
-                if (neighbour, neighbour_previous_directions[-3:]) in done:
+        return cls(Grid.from_string(text))
+
+    @cached_property
+    def blocks(self) -> dict[complex, int]:
+        return {
+            self.grid.coords(index): heat_loss
+            for index, heat_loss in enumerate(self.heat_losses)
+        }
+
+    @cached_property
+    def heat_losses(self) -> list[int]:
+        '''Heat loss of the blocks by flat index (`row * width + col`)'''
+        return (self.grid.flat - ord('0')).tolist()
+
+    def lower_bounds(self, end: complex) -> array:
+        '''Least heat loss from every block to the end, ignoring the runs.
+
+        Dijkstra's algorithm backwards from the end, with no crucible rules,
+        so it never overestimates the heat loss left. Cached by end block.
+        '''
+        end_index = int(end.imag) * self.width + int(end.real)
+        if end_index in self._lower_bounds:
+            return self._lower_bounds[end_index]
+
+        losses = self.heat_losses
+        width, height = self.width, self.height
+
+        bounds = array('q', [-1]) * (width * height)
+        bounds[end_index] = 0
+        buckets = [[end_index]]
+
+        for bound, bucket in enumerate(buckets):
+            for index in bucket:
+                if bounds[index] != bound:
                     continue
-                insertion_order += 1
-                neighbour_heat = lost_heat + self.blocks[neighbour]
-                heapq.heappush(
-                    min_heap,
-                    (
-                        neighbour_heat,
-                        insertion_order,
-                        neighbour,
-                        neighbour_previous_directions
-                    )
-                )
-
-        for (block, _), (heat_loss, path) in done.items():
-            if block == end:
-                return heat_loss, path
-        raise ValueError('Path not found!')
-
-    def find_allowed_directions(
+
+                # Going from the neighbour to this block loses its heat
+                next_bound = bound + losses[index]
+                row, col = divmod(index, width)
+                for step_col, step_row in STEPS:
+                    next_col, next_row = col + step_col, row + step_row
+                    if not (0 <= next_col < width and 0 <= next_row < height):
+                        continue
+                    next_index = next_row * width + next_col
+                    if bounds[next_index] == -1 or next_bound < bounds[next_index]:
+                        bounds[next_index] = next_bound
+                        while len(buckets) <= next_bound:
+                            buckets.append([])
+                        buckets[next_bound].append(next_index)
+            buckets[bound] = []
+
+        self._lower_bounds[end_index] = bounds
+        return bounds
+
+    def search(
         self,
-        coords: complex,
-        previous_directions: tuple[Direction, ...]
-    ) -> tuple[Direction, ...]:
+        start: complex,
+        end: complex,
+        crucible: 'Crucible',
+        a_star: bool = False,
+        stats: 'SearchStats | None' = None
+    ) -> tuple[int, int, array]:
+        '''Dijkstra (or A* with `a_star`) over packed states. Returns the heat
+        loss, the final state and the predecessors for `unwind_path`'''
+        start_index = int(start.imag) * self.width + int(start.real)
+        end_index = int(end.imag) * self.width + int(end.real)
+        bounds = self.lower_bounds(end) if a_star else None
+
+        state, heats, predecessors = self.explore(
+            start_index, end_index, crucible, bounds, stats
+        )
+        if state == -1:
+            raise ValueError('Path not found!')
+        return heats[state], state, predecessors
+
+    def search_tree(
+        self, start: complex, crucible: 'Crucible'
+    ) -> tuple[array, array]:
+        '''Heat losses and predecessors of the best paths to every state'''
+        start_index = int(start.imag) * self.width + int(start.real)
+        _, heats, predecessors = self.explore(start_index, -1, crucible)
+        return heats, predecessors
+
+    def explore(
+        self,
+        start_index: int,
+        end_index: int,
+        crucible: 'Crucible',
+        bounds: array | None = None,
+        stats: 'SearchStats | None' = None
+    ) -> tuple[int, array, array]:
+        '''Search from a block until the end block is reached.
+
+        Blocks are given by flat index, and an `end_index` of -1 explores
+        every reachable state. Returns the final state (-1 if the end was not
+        reached), and the heat losses and predecessors of the states.
+        '''
+        losses = self.heat_losses
+        width, height = self.width, self.height
+        min_run, max_run = crucible.min_run, crucible.max_run
+
+        heats = array('q', [-1]) * (width * height * len(AXES))
+        predecessors = array('q', [-1]) * (width * height * len(AXES))
+
+        if bounds is None:
+            bounds = array('q', [0]) * (width * height)
+        if bounds[start_index] == -1:
+            return -1, heats, predecessors
+
+        # From the start, the crucible can leave along any axis
+        start_states = [pack_state(start_index, axis) for axis in AXES]
+        for state in start_states:
+            heats[state] = 0
+        buckets = [[] for _ in range(bounds[start_index])] + [start_states]
+        expanded = 0
+        final_state = -1
+
+        for priority, bucket in enumerate(buckets):
+            for state in bucket:
+                index, axis = unpack_state(state)
+                heat = heats[state]
+                if heat + bounds[index] != priority:
+                    continue # Reached later with less heat loss
+
+                expanded += 1
+                if index == end_index:
+                    final_state = state
+                    break
+
+                row, col = divmod(index, width)
+                for direction in TURNS[axis]:
+                    step_col, step_row = STEPS[direction]
+                    next_axis = AXIS_OF[direction]
+                    next_heat = heat
+                    next_col, next_row = col, row
+                    for run in range(1, max_run + 1):
+                        next_col += step_col
+                        next_row += step_row
+                        if not (0 <= next_col < width and 0 <= next_row < height):
+                            break
+
+                        next_index = next_row * width + next_col
+                        next_heat += losses[next_index]
+                        if run < min_run:
+                            continue
+
+                        next_state = pack_state(next_index, next_axis)
+                        if heats[next_state] == -1 or next_heat < heats[next_state]:
+                            heats[next_state] = next_heat
+                            predecessors[next_state] = state
+                            next_priority = next_heat + bounds[next_index]
+                            while len(buckets) <= next_priority:
+                                buckets.append([])
+                            buckets[next_priority].append(next_state)
+
+            buckets[priority] = [] # Release the visited states
+            if final_state != -1:
+                break
 
-        allowed = []
-        for direction in Direction:
-            if (
-                len(previous_directions) >= 3 and
-                previous_directions[-3:] == (direction, direction, direction)
-            ):
-                continue
+        if stats is not None:
+            stats.expanded += expanded
+            stats.reached += sum(1 for heat in heats if heat != -1)
+        return final_state, heats, predecessors
 
-            if (previous_directions and previous_directions[-1] == -direction):
-                continue
+    def unwind_path(
+        self, state: int, predecessors: array
+    ) -> tuple[Direction, ...]:
+        path: list[Direction] = []
+        while predecessors[state] != -1:
+            previous = predecessors[state]
+            (index, _), (previous_index, _) = (
+                unpack_state(state), unpack_state(previous)
+            )
+            row, col = divmod(index, self.width)
+            previous_row, previous_col = divmod(previous_index, self.width)
+            delta = complex(col - previous_col, row - previous_row)
+            run = int(abs(delta))
+            path.extend((Direction(delta / run),) * run)
+            state = previous
+        return tuple(reversed(path))
 
-            new_block = coords + direction
-            if new_block in self.blocks:
-                allowed.append(direction)
-        return tuple(allowed)
+    def find_best_path(
+        self, start: complex, end: complex, crucible: 'Crucible | None' = None
+    ) -> tuple[int, tuple[Direction, ...]]:
+        heat_loss, state, predecessors = self.search(
+            start, end, crucible or CRUCIBLE
+        )
+        return heat_loss, self.unwind_path(state, predecessors)
 
     def find_best_ultra_path(
         self, start: complex, end: complex
-    ) -> tuple[int, list[Direction]]:
-
-        # Dijkstra's Algorithm
-        done: dict[
-            tuple[complex, tuple[Direction, ...]],
-            tuple[int, list[Direction]]
-        ] = {}
-        min_heap = []
-        insertion_order = 0 # To sort equal heat elements in heap
+    ) -> tuple[int, tuple[Direction, ...]]:
+        return self.find_best_path(start, end, ULTRA_CRUCIBLE)
 
-        heapq.heappush(min_heap, (0, insertion_order, start, tuple()))
-        while min_heap:
-            lost_heat, _, coords, previous_directions = heapq.heappop(min_heap)
+class HeatLossService:
+    '''Best paths between many pairs of blocks of the same city map.
 
-            if (coords, previous_directions[-10:]) in done:
-                continue
-
-            done[coords, previous_directions[-10:]] = lost_heat, previous_directions
-
-            if coords == end and len(set(previous_directions[-4:])) == 1:
-                break
+    The whole search tree of every start block is kept, so later queries
+    from that block are answered without searching again. Only the
+    `max_trees` most recently used trees are kept.
+    '''
 
-            for direction in self.find_allowed_ultra_directions(
-                coords, previous_directions
-            ):
-                neighbour_previous_directions = (*previous_directions, direction)
-                neighbour = coords + direction
-                if (neighbour, neighbour_previous_directions[-10:]) in done:
-                    continue
-                insertion_order += 1
-                neighbour_heat = lost_heat + self.blocks[neighbour]
-                heapq.heappush(
-                    min_heap,
-                    (
-                        neighbour_heat,
-                        insertion_order,
-                        neighbour,
-                        neighbour_previous_directions
-                    )
-                )
-
-        for (block, _), (heat_loss, path) in done.items():
-            if block == end and len(set(path[-4:])) == 1:
-                return heat_loss, path
-        raise ValueError('Path not found!')
-
-    def find_allowed_ultra_directions(
+    def __init__(
         self,
-        coords: complex,
-        previous_directions: tuple[Direction, ...]
-    ) -> tuple[Direction, ...]:
-
-        allowed = []
-
-        if previous_directions and (
-            previous_directions[-4:] != (previous_directions[-1],) * 4
-        ):
-            if coords + previous_directions[-1] in self.blocks:
-                return (previous_directions[-1],)
-            return tuple()
-
-        for direction in Direction:
-
-            if (
-                len(previous_directions) >= 10 and
-                previous_directions[-10:] == (direction,) * 10
-            ):
-                continue
+        city_map: CityMap,
+        crucible: 'Crucible | None' = None,
+        max_trees: int = 8
+    ) -> None:
+        if max_trees < 1:
+            raise ValueError('At least one search tree must be cached')
+        self.city_map = city_map
+        self.crucible = crucible or CRUCIBLE
+        self.max_trees = max_trees
+
+        self.trees: OrderedDict[complex, tuple[array, array]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_tree(self, start: complex) -> tuple[array, array]:
+        if start in self.trees:
+            self.hits += 1
+            self.trees.move_to_end(start)
+            return self.trees[start]
+
+        self.misses += 1
+        tree = self.city_map.search_tree(start, self.crucible)
+        self.trees[start] = tree
+        if len(self.trees) > self.max_trees:
+            self.trees.popitem(last=False)
+            self.evictions += 1
+        return tree
+
+    def find_end_state(
+        self, start: complex, end: complex
+    ) -> tuple[int, int, array]:
+        '''Heat loss, best state at the end block and the predecessors'''
+        heats, predecessors = self.get_tree(start)
+        end_index = int(end.imag) * self.city_map.width + int(end.real)
+        reached = [
+            state for state in (pack_state(end_index, axis) for axis in AXES)
+            if heats[state] != -1
+        ]
+        if not reached:
+            raise ValueError('Path not found!')
+        state = min(reached, key=heats.__getitem__)
+        return heats[state], state, predecessors
+
+    def find_heat_loss(self, start: complex, end: complex) -> int:
+        heat_loss, *_ = self.find_end_state(start, end)
+        return heat_loss
 
-            if (
-                previous_directions and
-                previous_directions[-1] == -direction
-            ):
-                continue
+    def find_best_path(
+        self, start: complex, end: complex
+    ) -> tuple[int, tuple[Direction, ...]]:
+        heat_loss, state, predecessors = self.find_end_state(start, end)
+        return heat_loss, self.city_map.unwind_path(state, predecessors)
+
+    @property
+    def stats(self) -> 'ServiceStats':
+        return ServiceStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            trees=len(self.trees),
+            tree_bytes=sum(
+                len(table) * table.itemsize
+                for tree in self.trees.values() for table in tree
+            )
+        )
+
+@dataclass
+class ServiceStats:
+    hits: int
+    misses: int
+    evictions: int
+    trees: int
+    tree_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        queries = self.hits + self.misses
+        return self.hits / queries if queries else 0.0
+
+@dataclass
+class SearchStats:
+    expanded: int = 0 # States taken out of the queue and relaxed
+    reached: int = 0 # States that got a heat loss
+
+@dataclass(frozen=True)
+class Crucible:
+    min_run: int = 1 # Blocks in a straight line before it can turn
+    max_run: int = 3 # Blocks in a straight line before it must turn
+
+    def __post_init__(self):
+        if not 1 <= self.min_run <= self.max_run:
+            raise ValueError(
+                f'Invalid runs for a crucible: {self.min_run}-{self.max_run}'
+            )
+
+CRUCIBLE = Crucible(1, 3)
+ULTRA_CRUCIBLE = Crucible(4, 10)
+
+def pack_state(index: int, axis: int) -> int:
+    return index * len(AXES) + axis
+
+def unpack_state(state: int) -> tuple[int, int]:
+    index, axis = divmod(state, len(AXES))
+    return index, axis
+
+def parse(input_text: str) -> CityMap:
+    return CityMap.from_string(input_text)
+
+def solve_part_1(city_map: CityMap) -> int:
+    end = (city_map.width - 1) + (city_map.height - 1) * 1j
+    heat_loss, *_ = city_map.search(0, end, CRUCIBLE, a_star=True)
+    return heat_loss
 
-            new_block = coords + direction
-            if new_block in self.blocks:
-                allowed.append(direction)
-        return tuple(allowed)
+def solve_part_2(city_map: CityMap) -> int:
+    end = (city_map.width - 1) + (city_map.height - 1) * 1j
+    heat_loss_ultra, *_ = city_map.search(0, end, ULTRA_CRUCIBLE, a_star=True)
+    return heat_loss_ultra
 
 def main(input_text: str):
-    city_map = CityMap.from_string(input_text)
-    end = (city_map.width - 1) + (city_map.height - 1) * 1j
-    heat_loss, _ = city_map.find_best_path(0, end)
-    print(f'Solution part 1: {heat_loss}')
-
-    # This takes a lot of RAM and time. For less resource consuming solution
-    # consider creating a version that did not return the path, so
-    # it would need to track only the last 10 elements of each path.
-    heat_loss_ultra, _ = city_map.find_best_ultra_path(0, end)
-    print(f'Solution part 2: {heat_loss_ultra}')
+    city_map = parse(input_text)
+    print(f'Solution part 1: {solve_part_1(city_map)}')
+
+    print(f'Solution part 2: {solve_part_2(city_map)}')
 
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read()
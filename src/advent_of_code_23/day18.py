@@ -93,20 +93,34 @@ class Trench:
     def total_volume(self) -> int:
         return self.edge_cubes_count + self.interior_cubes_count
 
-def main(input_text: str):
+def parse(input_text: str) -> tuple[list[Instruction], list[Instruction]]:
     instructions = [
         parse_instruction(instruction)
         for instruction in input_text.strip().splitlines()
     ]
-    trench = Trench.from_instructions(instructions)
-    print(f'Solution part 1: {trench.total_volume}')
-
     rgb_instructions = [
         parse_rgb_instruction(instruction)
         for instruction in input_text.strip().splitlines()
     ]
-    rgb_trench = Trench.from_instructions(rgb_instructions)
-    print(f'Solution part 2: {rgb_trench.total_volume}')
+    return instructions, rgb_instructions
+
+def solve_part_1(
+    instructions: tuple[list[Instruction], list[Instruction]]
+) -> int:
+    trench = Trench.from_instructions(instructions[0])
+    return trench.total_volume
+
+def solve_part_2(
+    instructions: tuple[list[Instruction], list[Instruction]]
+) -> int:
+    rgb_trench = Trench.from_instructions(instructions[1])
+    return rgb_trench.total_volume
+
+def main(input_text: str):
+    instructions = parse(input_text)
+    print(f'Solution part 1: {solve_part_1(instructions)}')
+
+    print(f'Solution part 2: {solve_part_2(instructions)}')
 
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read()
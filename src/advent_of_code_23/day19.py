@@ -185,7 +185,7 @@ class OrganizationSystem:
 
         return total_count
 
-def main(input_text: str):
+def parse(input_text: str) -> tuple[OrganizationSystem, list[Part]]:
     workflows_texts, parts_texts = input_text.strip().split('\n\n')
 
     workflows = [
@@ -196,16 +196,30 @@ def main(input_text: str):
         Part.from_string(text)
         for text in parts_texts.strip().splitlines()
     ]
-    system = OrganizationSystem(workflows)
+    return OrganizationSystem(workflows), parts
 
-    total = sum(
+def solve_part_1(
+    system_and_parts: tuple[OrganizationSystem, list[Part]]
+) -> int:
+    system, parts = system_and_parts
+    return sum(
         part.value if system.evaluate_part(part) == 'A' else 0
         for part in parts
     )
-    print(f'Solution part 1: {total}')
 
+def solve_part_2(
+    system_and_parts: tuple[OrganizationSystem, list[Part]]
+) -> int:
+    system, _ = system_and_parts
     ranges = CategoryRanges(*(range(1, 4001) for _ in range(4)))
-    combinations = system.count_combinations('in', ranges)
+    return system.count_combinations('in', ranges)
+
+def main(input_text: str):
+    system_and_parts = parse(input_text)
+    total = solve_part_1(system_and_parts)
+    print(f'Solution part 1: {total}')
+
+    combinations = solve_part_2(system_and_parts)
     print(f'Solution part 2: {combinations}')
 
 if __name__ == "__main__":
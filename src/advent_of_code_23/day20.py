@@ -4,6 +4,7 @@
 # pylint: disable=missing-class-docstring
 
 import sys
+from copy import deepcopy
 from dataclasses import dataclass, field
 from typing import Literal, Self
 
@@ -119,15 +120,19 @@ def multiple_pushes(circuit: Circuit, pushes: int) -> list[Pulse]:
     return sent_pulses
 
 
-def main(input_text: str):
-    circuit = Circuit.from_string(input_text)
+def parse(input_text: str) -> Circuit:
+    return Circuit.from_string(input_text)
+
+def solve_part_1(circuit: Circuit) -> int:
+    circuit = deepcopy(circuit)
     sent_pulses = multiple_pushes(circuit, pushes=10_000)
     low_pulses = [pulse for pulse in sent_pulses if not pulse.level]
     high_pulses = [pulse for pulse in sent_pulses if pulse.level]
-    print(f'Solution part 1: {len(low_pulses) * len(high_pulses)}')
+    return len(low_pulses) * len(high_pulses)
 
+def solve_part_2(circuit: Circuit) -> int:
     # Part 2 particular solution
-    circuit = Circuit.from_string(input_text)
+    circuit = deepcopy(circuit)
     out_nand_module = None
     for module in circuit.modules.values():
         if 'rx' in module.outputs:
@@ -154,7 +159,13 @@ def main(input_text: str):
         if len(set(differences)) != 1:
             raise ValueError(f'Loop not found for module {dependency}!')
         lcm *= differences[0]
-    print(f'Solution part 2: {lcm}')
+    return lcm
+
+def main(input_text: str):
+    circuit = parse(input_text)
+    print(f'Solution part 1: {solve_part_1(circuit)}')
+
+    print(f'Solution part 2: {solve_part_2(circuit)}')
 
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read()
@@ -8,6 +8,8 @@ import sys
 from collections import deque
 from typing import Iterable, Self
 
+from advent_of_code_23.grid import Grid
+
 class Garden:
 
     def __init__(
@@ -24,25 +26,19 @@ class Garden:
 
     @classmethod
     def from_string(cls, text: str) -> Self:
-        lines = text.strip().splitlines()
-
-        heigth = len(lines)
-        width = len(lines[0])
-        rocks = []
-        start = None
-
-        for row, line in enumerate(lines):
-            for col, plot in enumerate(line):
-                if plot == 'S':
-                    start = col + row*1j
-                elif plot == '#':
-                    rocks.append(col + row*1j)
+        return cls.from_grid(Grid.from_string(text))
 
-        if start is None:
+    @classmethod
+    def from_grid(cls, grid: Grid) -> Self:
+        starts = grid.find('S')
+        if not starts:
             raise ValueError('Unknown starting plot!')
 
         return cls(
-            rocks=rocks, width=width, heigth=heigth, start=start
+            rocks=grid.find('#'),
+            width=grid.width,
+            heigth=grid.height,
+            start=starts.pop()
         )
 
     def find_final_reachable_plots(self, steps: int) -> set[complex]:
@@ -256,17 +252,29 @@ class InfiniteGarden(Garden):
         return internal_plots + diagonal_gardens_plots + tip_gardens_plots
 
 
-def main(input_text: str):
-    garden = Garden.from_string(input_text)
+def parse(input_text: str) -> tuple[Garden, InfiniteGarden]:
+    return (
+        Garden.from_string(input_text),
+        InfiniteGarden.from_string(input_text)
+    )
+
+def solve_part_1(gardens: tuple[Garden, InfiniteGarden]) -> int:
+    garden, _ = gardens
     plots = garden.find_final_reachable_plots(steps=64)
-    print(f'Solution part 1: {len(plots)}')
+    return len(plots)
 
-    infinite_garden = InfiniteGarden.from_string(input_text)
-    infinite_plots = infinite_garden.find_final_reachable_plots_count_particular(
+def solve_part_2(gardens: tuple[Garden, InfiniteGarden]) -> int:
+    _, infinite_garden = gardens
+    return infinite_garden.find_final_reachable_plots_count_particular(
         26501365
     )
-    print(f'Solution part 2: {infinite_plots}')
 
+def main(input_text: str):
+    gardens = parse(input_text)
+    print(f'Solution part 1: {solve_part_1(gardens)}')
+
+    infinite_plots = solve_part_2(gardens)
+    print(f'Solution part 2: {infinite_plots}')
 
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read()
@@ -45,6 +45,11 @@ class Tower:
 
     def __init__(self, bricks: Iterable[Brick]) -> None:
         self.bricks = {brick.brick_id: brick for brick in bricks}
+        # Bricks in the order they were dropped, every brick comes after the
+        # bricks supporting it
+        self.order: list[str] = []
+        self.positions: dict[str, int] = {}
+        self._dominators: dict[str, str] | None = None
 
     def drop_bricks(self) -> None:
         column_heights: dict[tuple[int, int], tuple[int, str]] = defaultdict(
@@ -53,6 +58,11 @@ class Tower:
         bricks = sorted(
             self.bricks.values(), key=lambda brick: brick.base_height
         )
+        self.order = [brick.brick_id for brick in bricks]
+        self.positions = {
+            brick_id: position for position, brick_id in enumerate(self.order)
+        }
+        self._dominators = None
 
         for brick in bricks:
             support_height = 1
@@ -91,38 +101,88 @@ class Tower:
 
         return desintegrable
 
-    def get_dropping_bricks_if_desintegrate(self, brick_id: str) -> set[str]:
-        would_drop = set((brick_id,))
+    def get_dominators(self) -> dict[str, str]:
+        '''Immediate dominator of every brick in the support graph.
+
+        The dominator of a brick is the lowest brick (or the FLOOR) that all
+        its paths down to the floor go through: if it is desintegrated, the
+        brick falls. It is the common ancestor of its supports in the tree
+        of dominators, built bottom up in the drop order.
+        '''
+        if self._dominators is not None:
+            return self._dominators
+
+        dominators: dict[str, str] = {}
+        depths = {'FLOOR': 0}
+        for brick_id in self.order:
+            supports = iter(self.bricks[brick_id].is_supported_by)
+            dominator = next(supports)
+            for support_brick_id in supports:
+                dominator = self._common_dominator(
+                    dominator, support_brick_id, dominators, depths
+                )
+            dominators[brick_id] = dominator
+            depths[brick_id] = depths[dominator] + 1
+
+        self._dominators = dominators
+        return dominators
+
+    @staticmethod
+    def _common_dominator(
+        first: str, second: str, dominators: dict[str, str],
+        depths: dict[str, int]
+    ) -> str:
+        while depths[first] > depths[second]:
+            first = dominators[first]
+        while depths[second] > depths[first]:
+            second = dominators[second]
+        while first != second:
+            first, second = dominators[first], dominators[second]
+        return first
+
+    def get_falling_counts(self) -> dict[str, int]:
+        '''Number of bricks that fall if each brick is desintegrated'''
+        dominators = self.get_dominators()
+        counts = dict.fromkeys(self.order, 0)
+        for brick_id in reversed(self.order):
+            dominator = dominators[brick_id]
+            if dominator != 'FLOOR':
+                counts[dominator] += counts[brick_id] + 1
+        return counts
 
-        bricks = sorted(
-            self.bricks.values(), key=lambda brick: brick.base_height
-        )
+    def get_dropping_bricks_if_desintegrate(self, brick_id: str) -> set[str]:
+        position = self.positions.get(brick_id)
+        if position is None: # The bricks haven't been dropped yet
+            return set()
 
-        for brick in bricks:
-            if brick.brick_id in would_drop:
-                for support_brick_id in brick.is_support_of:
-                    supported_brick = self.bricks[support_brick_id]
-                    if all(
-                        support in would_drop
-                        for support in supported_brick.is_supported_by
-                    ):
-                        would_drop.add(supported_brick.brick_id)
+        dominators = self.get_dominators()
+        would_drop = set((brick_id,))
+        for other_brick_id in self.order[position + 1:]:
+            if dominators[other_brick_id] in would_drop:
+                would_drop.add(other_brick_id)
 
         would_drop.remove(brick_id)
         return would_drop
 
-def main(input_text: str):
+def parse(input_text: str) -> Tower:
     lines = input_text.strip().splitlines()
     bricks = [Brick.from_string(line) for line in lines]
     tower = Tower(bricks=bricks)
     tower.drop_bricks()
+    return tower
+
+def solve_part_1(tower: Tower) -> int:
     desintegrable = tower.get_safely_desintegrable_brick_ids()
-    print(f'Solution part 1: {len(desintegrable)}')
+    return len(desintegrable)
+
+def solve_part_2(tower: Tower) -> int:
+    return sum(tower.get_falling_counts().values())
+
+def main(input_text: str):
+    tower = parse(input_text)
+    print(f'Solution part 1: {solve_part_1(tower)}')
 
-    potential_brick_falling = sum(
-        len(tower.get_dropping_bricks_if_desintegrate(brick_id))
-        for brick_id in tower.bricks.keys()
-    )
+    potential_brick_falling = solve_part_2(tower)
     print(f'Solution part 2: {potential_brick_falling}')
 
 if __name__ == "__main__":
@@ -3,10 +3,18 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=missing-class-docstring
 
+import multiprocessing
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Self
+from typing import Any, Self
+
+import numpy as np
+
+from advent_of_code_23.grid import Grid
 
 class Direction(complex, Enum):
     UP = -1j
@@ -14,6 +22,13 @@ class Direction(complex, Enum):
     LEFT = -1
     RIGHT = 1
 
+SLOPES = {
+    Direction.UP: '^', Direction.RIGHT: '>',
+    Direction.DOWN: 'v', Direction.LEFT: '<'
+}
+# Bit of the opposite direction, with the bits in the order of SLOPES
+REVERSE_BITS = (2, 3, 0, 1)
+
 @dataclass
 class Node:
     coords: complex
@@ -28,79 +43,84 @@ class HikingMap:
     @classmethod
     def from_string(cls, text: str, slippery: bool = True) -> Self:
 
-        map_lines = text.strip().splitlines()
-        height = len(map_lines)
-        width = len(map_lines[0])
-
-        start, end = None, None
-        for col in range(len(map_lines[0])):
-            if map_lines[0][col] == '.':
-                start = col + 0j
-            if map_lines[-1][col] == '.':
-                end = col + (height - 1) * 1j
-        if start is None or end is None:
+        grid = Grid.from_string(text)
+        starts = np.flatnonzero(grid.tiles[0] == ord('.'))
+        ends = np.flatnonzero(grid.tiles[-1] == ord('.'))
+        if not starts.size or not ends.size:
             raise ValueError("Couldn't determine start and/or end")
+        start = complex(int(starts[-1]), 0)
+        end = complex(int(ends[-1]), grid.height - 1)
 
-        allowed_directions: dict[str, list[Direction]] = {
-            '#': [], '.': list(Direction),
-            '>': [Direction.RIGHT], '<': [Direction.LEFT],
-            'v': [Direction.DOWN], '^': [Direction.UP]
-        }
-        if not slippery:
-            for tile_type in '><^v':
-                allowed_directions[tile_type] = list(Direction)
-
-        # Find nodes using DFS
-        node_coords_to_explore = []
-        node_coords_to_explore.append(start)
-        explored_nodes = {}
-        while node_coords_to_explore:
-            node_coords = node_coords_to_explore.pop()
+        # Flat tiles with a border of forest, so no move leaves the map
+        padded = Grid(np.pad(grid.tiles, 1, constant_values=ord('#')))
+        padded_width = padded.width
+        tiles = padded.tiles
+        is_open = tiles != ord('#')
 
-            if node_coords in explored_nodes:
-                continue
+        def to_index(coords: complex) -> int:
+            return padded.index(coords + 1 + 1j)
 
-            node = Node(node_coords)
+        def to_coords(index: int) -> complex:
+            return padded.coords(index) - (1 + 1j)
 
-            # Find adjacent nodes using DFS
-            tiles_to_visit = []
-            tiles_to_visit.append((node_coords, 0))
-            visited = set()
-            while tiles_to_visit:
-                tile, distance = tiles_to_visit.pop()
+        # Bitmask of the moves allowed from every tile
+        steps = []
+        moves = np.zeros(tiles.shape, dtype=np.uint8)
+        for bit, (direction, slope) in enumerate(SLOPES.items()):
+            step_col, step_row = int(direction.real), int(direction.imag)
+            steps.append(step_row * padded_width + step_col)
+            allowed = is_open & np.roll(is_open, (-step_row, -step_col), (0, 1))
+            if slippery:
+                allowed &= (tiles == ord('.')) | (tiles == ord(slope))
+            moves |= allowed.astype(np.uint8) << bit
 
-                if tile in visited:
-                    continue
-                visited.add(tile)
-
-                # Count neighbours to determine if it is a node or not
-                neighbours: list[complex] = []
-                tile_label = map_lines[int(tile.imag)][int(tile.real)]
-                for direction in allowed_directions[tile_label]:
-                    neighbour = tile + direction
-                    if not 0 <= neighbour.real < width:
-                        continue
-                    if not 0 <= neighbour.imag < height:
-                        continue
-                    if map_lines[int(neighbour.imag)][int(neighbour.real)] == '#':
-                        continue
-
-                    neighbours.append(neighbour)
-
-                is_node = len(neighbours) > 2 or tile in (start, end)
-                if is_node and distance:
-                    node.edges[tile] = distance
-                    if tile not in explored_nodes:
-                        node_coords_to_explore.append(tile)
+        moves_count = np.zeros(tiles.shape, dtype=np.uint8)
+        for bit in range(len(steps)):
+            moves_count += (moves >> bit) & 1
+        is_node = is_open & (moves_count > 2)
+        is_node.flat[[to_index(start), to_index(end)]] = True
+
+        # Walk every corridor from both of its ends, once. Slopes can loop
+        # without a junction, no corridor is longer than the open tiles
+        max_distance = int(is_open.sum())
+        flat_moves = moves.tobytes()
+        flat_is_node = is_node.tobytes()
+        edges: dict[int, dict[int, int]] = {}
+        for node_index in np.flatnonzero(is_node).tolist():
+            node_edges = edges[node_index] = {}
+            for bit, step in enumerate(steps):
+                if not flat_moves[node_index] >> bit & 1:
                     continue
+                index = node_index + step
+                distance = 1
+                while not flat_is_node[index]:
+                    # Only one way forward in a corridor, never back
+                    options = flat_moves[index] & ~(1 << REVERSE_BITS[bit])
+                    if not options or distance > max_distance:
+                        break # Dead end, or a loop of slopes
+                    bit = (options & -options).bit_length() - 1
+                    index += steps[bit]
+                    distance += 1
+                else:
+                    if index != node_index:
+                        node_edges[index] = max(node_edges.get(index, 0), distance)
 
-                # Else, it is part of the path, continue searching
-                for neighbour in neighbours:
-                    if neighbour in visited:
-                        continue
-                    tiles_to_visit.append((neighbour, distance + 1))
+        # Keep the junctions that can be reached from the start
+        explored_nodes = {}
+        node_indices_to_explore = [to_index(start)]
+        while node_indices_to_explore:
+            node_index = node_indices_to_explore.pop()
+            node_coords = to_coords(node_index)
+            if node_coords in explored_nodes:
+                continue
+            explored_nodes[node_coords] = Node(node_coords, {
+                to_coords(neighbour): distance
+                for neighbour, distance in edges[node_index].items()
+            })
+            node_indices_to_explore.extend(edges[node_index])
 
-            explored_nodes[node_coords] = node
+        if end not in explored_nodes:
+            raise ValueError("Couldn't reach the end from the start")
 
         return cls(
             nodes=explored_nodes,
@@ -108,43 +128,269 @@ class HikingMap:
             end=explored_nodes[end]
         )
 
+    def compile(self) -> 'JunctionGraph':
+        ids = {coords: node_id for node_id, coords in enumerate(self.nodes)}
+        return JunctionGraph(
+            coords=list(self.nodes),
+            adjacency=[
+                [(ids[neighbour], distance) for neighbour, distance in node.edges.items()]
+                for node in self.nodes.values()
+            ],
+            start=ids[self.start.coords],
+            end=ids[self.end.coords]
+        )
+
     def find_longest_path(self) -> tuple[list[complex], int]:
-        longest_distance = -float('inf')
-        longest_path = []
+        graph = self.compile()
+        path, distance = graph.find_longest_path()
+        return [graph.coords[node_id] for node_id in path], distance
 
-        to_visit = []
-        to_visit.append(([self.start.coords], 0))
+    def find_longest_path_parallel(
+        self, depth: int = 4, workers: int | None = None
+    ) -> tuple[tuple[list[complex], int], list['WorkerStats']]:
+        graph = self.compile()
+        (path, distance), stats = graph.find_longest_path_parallel(depth, workers)
+        return ([graph.coords[node_id] for node_id in path], distance), stats
 
-        while to_visit:
-            path, current_distance = to_visit.pop()
-            current_tile = path[-1]
+@dataclass
+class JunctionGraph:
+    '''Junctions as integer ids, with the edges as (neighbour, distance)'''
+    coords: list[complex]
+    adjacency: list[list[tuple[int, int]]]
+    start: int
+    end: int
+
+    def pruned_adjacency(self) -> list[list[tuple[int, int]]]:
+        '''Adjacency where the only junction leading to the end goes there.
+
+        Leaving that junction any other way, the end could not be reached
+        again without crossing it twice.
+        '''
+        adjacency = [list(edges) for edges in self.adjacency]
+        entries = [
+            (node_id, distance)
+            for node_id, edges in enumerate(adjacency)
+            for neighbour, distance in edges if neighbour == self.end
+        ]
+        if len(entries) == 1:
+            last_junction, distance = entries[0]
+            adjacency[last_junction] = [(self.end, distance)]
+        return adjacency
+
+    def find_longest_path(
+        self, stats: 'SearchStats | None' = None
+    ) -> tuple[list[int], int]:
+        path, distance, expanded, pruned = BranchAndBound(
+            self.pruned_adjacency(), self.end
+        ).search([self.start], 0)
+
+        if stats is not None:
+            stats.expanded += expanded
+            stats.pruned += pruned
+        if distance == -1:
+            raise ValueError('Path not found!')
+        return path, distance
 
-            if current_tile == self.end.coords:
-                if current_distance > longest_distance:
-                    longest_distance = current_distance
-                    longest_path = path
+    def find_prefixes(
+        self, adjacency: list[list[tuple[int, int]]], depth: int
+    ) -> list[tuple[list[int], int]]:
+        '''Simple paths from the start with `depth` edges (or ending before)'''
+        prefixes = []
+        pending = [([self.start], 0)]
+        while pending:
+            path, distance = pending.pop()
+            node_id = path[-1]
+            if len(path) > depth or node_id == self.end:
+                prefixes.append((path, distance))
                 continue
+            for neighbour, edge_distance in adjacency[node_id]:
+                if neighbour not in path:
+                    pending.append((path + [neighbour], distance + edge_distance))
+        return prefixes
 
-            for neighbour, distance in self.nodes[current_tile].edges.items():
-                if neighbour in path:
-                    continue
-                to_visit.append(
-                    (path + [neighbour], current_distance + distance)
-                )
+    def find_longest_path_parallel(
+        self, depth: int = 4, workers: int | None = None
+    ) -> tuple[tuple[list[int], int], list['WorkerStats']]:
+        '''Search the subtrees below every DFS prefix in a pool of processes.
+
+        The longest distance found so far is shared by the workers, and a
+        subtree is pruned once even taking the longest edge into every
+        junction left could not beat it.
+        '''
+        adjacency = self.pruned_adjacency()
+        prefixes = self.find_prefixes(adjacency, depth)
 
+        shared_best = multiprocessing.Value('q', -1)
+        longest_path: list[int] = []
+        longest_distance = -1
+        stats: dict[int, WorkerStats] = {}
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(adjacency, self.end, shared_best)
+        ) as pool:
+            for pid, (path, distance, expanded, pruned), elapsed in pool.map(
+                _search_subtree, prefixes
+            ):
+                worker_stats = stats.setdefault(pid, WorkerStats(pid))
+                worker_stats.subtrees += 1
+                worker_stats.expanded += expanded
+                worker_stats.pruned += pruned
+                worker_stats.seconds += elapsed
+                if distance > longest_distance:
+                    longest_path, longest_distance = path, distance
 
-        if longest_distance == -float('inf'):
+        if longest_distance == -1:
             raise ValueError('Path not found!')
-        return longest_path, int(longest_distance)
+        return (longest_path, longest_distance), list(stats.values())
 
-def main(input_text: str):
-    hiking_map = HikingMap.from_string(input_text)
+class BranchAndBound:
+    '''Depth first search of the longest path, pruned by a reachability
+    bound. `shared_best` shares the longest distance between processes'''
+
+    def __init__(
+        self,
+        adjacency: list[list[tuple[int, int]]],
+        end: int,
+        shared_best: Any = None
+    ) -> None:
+        self.adjacency = [
+            [(neighbour, 1 << neighbour, distance) for neighbour, distance in edges]
+            for edges in adjacency
+        ]
+        self.end = end
+        self.shared_best = shared_best
+
+        self.best_entries = [0] * len(adjacency)
+        self.neighbour_masks = [0] * len(adjacency)
+        for node_id, edges in enumerate(adjacency):
+            for neighbour, distance in edges:
+                self.best_entries[neighbour] = max(
+                    self.best_entries[neighbour], distance
+                )
+                self.neighbour_masks[node_id] |= 1 << neighbour
+
+    def upper_bound(self, node_id: int, visited: int) -> int:
+        '''Most distance left from a junction, -1 if the end is unreachable'''
+        neighbour_masks, best_entries = self.neighbour_masks, self.best_entries
+        frontier = neighbour_masks[node_id] & ~visited
+        reached = frontier
+        bound = 0
+        while frontier:
+            next_frontier = 0
+            while frontier:
+                lowest = frontier & -frontier
+                frontier ^= lowest
+                reached_id = lowest.bit_length() - 1
+                bound += best_entries[reached_id]
+                next_frontier |= neighbour_masks[reached_id]
+            frontier = next_frontier & ~(visited | reached)
+            reached |= frontier
+        if not reached >> self.end & 1:
+            return -1
+        return bound
+
+    def search(
+        self, prefix: list[int], distance: int
+    ) -> tuple[list[int], int, int, int]:
+        '''Longest path and distance from a prefix (-1 if none is found)
+
+        Also returns how many junctions were expanded and pruned.
+        '''
+        adjacency, end, shared_best = self.adjacency, self.end, self.shared_best
+        upper_bound = self.upper_bound
+
+        path = list(prefix)
+        longest_path: list[int] = []
+        longest_distance = -1
+        known = -1 if shared_best is None else shared_best.value
+        expanded = 0
+        pruned = 0
+
+        def visit(node_id: int, visited: int, distance: int) -> None:
+            nonlocal longest_path, longest_distance, known, expanded, pruned
+            expanded += 1
+            if shared_best is not None and not expanded % 1024:
+                known = max(known, shared_best.value)
+
+            if node_id == end:
+                if distance > longest_distance:
+                    longest_path, longest_distance = path.copy(), distance
+                if distance > known:
+                    known = distance
+                    if shared_best is not None:
+                        with shared_best.get_lock():
+                            shared_best.value = max(shared_best.value, distance)
+                return
+
+            bound = upper_bound(node_id, visited)
+            if bound < 0 or distance + bound <= known:
+                pruned += 1
+                return
+
+            for neighbour, bit, edge_distance in adjacency[node_id]:
+                if visited & bit:
+                    continue
+                path.append(neighbour)
+                visit(neighbour, visited | bit, distance + edge_distance)
+                path.pop()
+
+        visited = 0
+        for node_id in path:
+            visited |= 1 << node_id
+        visit(path[-1], visited, distance)
+
+        return longest_path, longest_distance, expanded, pruned
+
+@dataclass
+class SearchStats:
+    expanded: int = 0 # Junctions reached by the search
+    pruned: int = 0 # Subtrees skipped by their upper bound
+
+@dataclass
+class WorkerStats:
+    pid: int
+    subtrees: int = 0
+    expanded: int = 0
+    pruned: int = 0
+    seconds: float = 0.0
+
+_WORKER_SEARCH: BranchAndBound | None = None
+
+def _init_worker(
+    adjacency: list[list[tuple[int, int]]], end: int, shared_best: Any
+) -> None:
+    global _WORKER_SEARCH # pylint: disable=global-statement
+    _WORKER_SEARCH = BranchAndBound(adjacency, end, shared_best)
+
+def _search_subtree(
+    prefix: tuple[list[int], int]
+) -> tuple[int, tuple[list[int], int, int, int], float]:
+    start_time = time.perf_counter()
+    result = _WORKER_SEARCH.search(*prefix)
+    return os.getpid(), result, time.perf_counter() - start_time
+
+def parse(input_text: str) -> tuple[HikingMap, HikingMap]:
+    return (
+        HikingMap.from_string(input_text),
+        HikingMap.from_string(input_text, False)
+    )
+
+def solve_part_1(hiking_maps: tuple[HikingMap, HikingMap]) -> int:
+    hiking_map, _ = hiking_maps
     _, distance = hiking_map.find_longest_path()
-    print(f'Solution part 1: {distance}')
+    return distance
 
-    non_slippery_hiking_map = HikingMap.from_string(input_text, False)
+def solve_part_2(hiking_maps: tuple[HikingMap, HikingMap]) -> int:
+    _, non_slippery_hiking_map = hiking_maps
     _, distance = non_slippery_hiking_map.find_longest_path()
-    print(f'Solution part 2: {distance}')
+    return distance
+
+def main(input_text: str):
+    hiking_maps = parse(input_text)
+    print(f'Solution part 1: {solve_part_1(hiking_maps)}')
+
+    print(f'Solution part 2: {solve_part_2(hiking_maps)}')
 
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read()
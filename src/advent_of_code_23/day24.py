@@ -114,15 +114,24 @@ def get_smashing_stone(hailstones: list[Hailstone]) -> Hailstone:
         velocity=(solution[vrx], solution[vry], solution[vrz]),
     )
 
-def main(input_text: str):
-    lines = input_text.splitlines()
-    hailstones = [Hailstone.from_string(line) for line in lines]
+def parse(input_text: str) -> list[Hailstone]:
+    lines = input_text.strip().splitlines()
+    return [Hailstone.from_string(line) for line in lines]
+
+def solve_part_1(hailstones: list[Hailstone]) -> int:
     boundaries = (200000000000000, 400000000000000)
-    cross_count = find_future_xy_crosses_in_area_count(hailstones, boundaries)
-    print(f'Solution part 1: {cross_count}')
+    return find_future_xy_crosses_in_area_count(hailstones, boundaries)
 
+def solve_part_2(hailstones: list[Hailstone]) -> int:
     stone = get_smashing_stone(hailstones)
-    print(f'Solution part 2: {sum(stone.position)}')
+    return sum(stone.position)
+
+def main(input_text: str):
+    hailstones = parse(input_text)
+    cross_count = solve_part_1(hailstones)
+    print(f'Solution part 1: {cross_count}')
+
+    print(f'Solution part 2: {solve_part_2(hailstones)}')
 
 if __name__ == "__main__":
     INPUT_TEXT = sys.stdin.read().strip()
@@ -62,12 +62,18 @@ def split_graph(
         splitted_graph[edge[1]].remove(edge[0])
     return splitted_graph
 
-def main(input_text: str):
-    graph = generate_graph_from_string(input_text)
+def parse(input_text: str) -> dict[str, set[str]]:
+    return generate_graph_from_string(input_text)
+
+def solve_part_1(graph: dict[str, set[str]]) -> int:
     cuts = find_splitting_edges(graph)
     splitted_graph = split_graph(graph, cuts)
     groups = get_graph_groups(splitted_graph)
-    result = prod(len(group) for group in groups)
+    return prod(len(group) for group in groups)
+
+def main(input_text: str):
+    graph = parse(input_text)
+    result = solve_part_1(graph)
     print(f'Solution day 25: {result}')
 
 if __name__ == "__main__":
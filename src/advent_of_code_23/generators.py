@@ -0,0 +1,581 @@
+'''Deterministic synthetic inputs to benchmark the solutions at scale.
+
+Every generator takes a `size` (its meaning depends on the day: grid side,
+number of records, number of nodes...) and a `seed`, and returns an input
+text in the same format as the puzzle inputs. The same arguments always
+produce the same text.
+'''
+
+# pylint: disable=missing-function-docstring
+
+import random
+import string
+from typing import Callable
+
+def generate_calibration_document(size: int, seed: int = 0) -> str:
+    '''`size` lines of letters, digits and spelled digits'''
+    rng = random.Random(seed)
+    words = (
+        'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine'
+    )
+    lines = []
+    for _ in range(size):
+        chunks = [rng.choice(string.digits[1:])]
+        for _ in range(rng.randint(2, 8)):
+            chunks.append(rng.choice((
+                ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 4))),
+                rng.choice(string.digits[1:]),
+                rng.choice(words)
+            )))
+        rng.shuffle(chunks)
+        lines.append(''.join(chunks))
+    return '\n'.join(lines)
+
+def generate_games(size: int, seed: int = 0) -> str:
+    '''`size` games of 1 to 6 sets of cubes'''
+    rng = random.Random(seed)
+    lines = []
+    for game_id in range(1, size + 1):
+        sets = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(('red', 'green', 'blue'), rng.randint(1, 3))
+            sets.append(', '.join(
+                f'{rng.randint(1, 20)} {color}' for color in colors
+            ))
+        lines.append(f'Game {game_id}: {"; ".join(sets)}')
+    return '\n'.join(lines)
+
+def generate_schematic(size: int, seed: int = 0) -> str:
+    '''`size` x `size` engine schematic'''
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        line = ''
+        while len(line) < size:
+            draw = rng.random()
+            if draw < 0.1:
+                line += str(rng.randint(1, 999)) + '.'
+            elif draw < 0.15:
+                line += rng.choice('*#+$/@=%&-')
+            else:
+                line += '.'
+        lines.append(line[:size])
+    return '\n'.join(lines)
+
+def generate_scratchcards(size: int, seed: int = 0) -> str:
+    '''`size` cards of 10 winning numbers and 25 numbers'''
+    rng = random.Random(seed)
+    lines = []
+    for card_id in range(1, size + 1):
+        winning = rng.sample(range(1, 100), 10)
+        others = [number for number in range(1, 100) if number not in winning]
+        # No card wins copies of cards past the end of the table
+        wins = rng.randint(0, min(10, size - card_id))
+        numbers = rng.sample(winning, wins) + rng.sample(others, 25 - wins)
+        rng.shuffle(numbers)
+        lines.append(
+            f'Card {card_id:3}: {" ".join(f"{n:2}" for n in winning)} | '
+            f'{" ".join(f"{n:2}" for n in numbers)}'
+        )
+    return '\n'.join(lines)
+
+def generate_almanac(size: int, seed: int = 0) -> str:
+    '''`size` seed ranges, and `size` ranges per map'''
+    rng = random.Random(seed)
+    categories = (
+        'seed', 'soil', 'fertilizer', 'water',
+        'light', 'temperature', 'humidity', 'location'
+    )
+    span = 10 * size
+
+    seeds = []
+    for _ in range(size):
+        seeds.extend((rng.randrange(span), rng.randrange(1, span // 2 + 2)))
+    parts = ['seeds: ' + ' '.join(str(seed) for seed in seeds)]
+
+    for source, destination in zip(categories, categories[1:]):
+        lines = [f'{source}-to-{destination} map:']
+        cuts = sorted(rng.sample(range(span), 2 * size))
+        for start, end in zip(cuts[::2], cuts[1::2]):
+            lines.append(f'{rng.randrange(span)} {start} {end - start}')
+        parts.append('\n'.join(lines))
+
+    return '\n\n'.join(parts)
+
+def generate_race_sheet(size: int, seed: int = 0) -> str:
+    '''`size` races, at most 9 so the ways to win the joined race fit in C'''
+    if not 1 <= size <= 9:
+        raise ValueError(f'A race sheet has 1 to 9 races, not {size}')
+    rng = random.Random(seed)
+    times, distances = [], []
+    for _ in range(size):
+        # Two digit times and three digit records, so the joined record is
+        # always beaten as well
+        time = rng.randint(21, 99)
+        times.append(time)
+        distances.append(rng.randint(100, min(999, time * time // 4 - 1)))
+    return (
+        'Time:     ' + ' '.join(f'{time:4}' for time in times) + '\n'
+        'Distance: ' + ' '.join(f'{distance:4}' for distance in distances)
+    )
+
+def generate_hands(size: int, seed: int = 0) -> str:
+    '''`size` hands of Camel Cards with their bids'''
+    rng = random.Random(seed)
+    return '\n'.join(
+        f'{"".join(rng.choices("AKQJT98765432", k=5))} {rng.randint(1, 1000)}'
+        for _ in range(size)
+    )
+
+def generate_network(size: int, seed: int = 0) -> str:
+    '''`size` instructions, and 6 ghost paths looping after 3 to 17 rounds'''
+    rng = random.Random(seed)
+    instructions = ''.join(rng.choices('LR', k=size))
+    rounds = (3, 5, 7, 11, 13, 17)
+
+    ghost_names = ['AAA', 'ZZZ']
+    while len(ghost_names) < 2 * len(rounds):
+        name = ''.join(rng.choices(string.ascii_uppercase[1:-1], k=2))
+        if name + 'A' not in ghost_names:
+            ghost_names.extend((name + 'A', name + 'Z'))
+
+    inner_count = sum(rounds) * size - len(rounds)
+    inner_names = set()
+    while len(inner_names) < inner_count:
+        inner_names.add(
+            ''.join(rng.choices(string.ascii_uppercase, k=3))
+            + rng.choice(string.ascii_uppercase[1:-1])
+        )
+    inner_names = sorted(inner_names)
+    rng.shuffle(inner_names)
+    all_names = ghost_names + inner_names
+
+    # Every ghost walks a chain from its start to its end and then back to
+    # the second node, so the end is reached every `rounds` instructions.
+    # A chain position is always crossed with the same instruction, the
+    # other way leads anywhere.
+    lines = []
+    for index, ghost_rounds in enumerate(rounds):
+        length = ghost_rounds * size
+        inner = [inner_names.pop() for _ in range(length - 1)]
+        chain = [ghost_names[2 * index], *inner, ghost_names[2 * index + 1]]
+        for position, name in enumerate(chain):
+            following = chain[position + 1] if position < length else chain[1]
+            other = rng.choice(all_names)
+            if instructions[position % size] == 'L':
+                lines.append(f'{name} = ({following}, {other})')
+            else:
+                lines.append(f'{name} = ({other}, {following})')
+    rng.shuffle(lines)
+
+    return instructions + '\n\n' + '\n'.join(lines)
+
+def generate_histories(size: int, seed: int = 0) -> str:
+    '''`size` polynomial sequences of 21 values'''
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 6))]
+        values = (
+            sum(
+                coefficient * x**power
+                for power, coefficient in enumerate(coefficients)
+            ) for x in range(21)
+        )
+        lines.append(' '.join(str(value) for value in values))
+    return '\n'.join(lines)
+
+def generate_pipe_maze(size: int, seed: int = 0) -> str:
+    '''`size` x `size` maze with a loop between two random skylines'''
+    if size < 5:
+        raise ValueError(f'A pipe maze is at least 5 x 5, not {size}')
+    rng = random.Random(seed)
+    last = size - 2
+
+    # The loop goes up the first column, along the top skyline, down the
+    # last column and back along the bottom one. The end columns take the
+    # heights of their neighbours, so no column is walked both ways.
+    tops = [rng.randint(1, size // 2 - 1) for _ in range(size)]
+    bottoms = [rng.randint(size // 2 + 1, size - 2) for _ in range(size)]
+    tops[1], bottoms[1] = tops[2], bottoms[2]
+    tops[last], bottoms[last] = tops[last - 1], bottoms[last - 1]
+
+    def vertical(col: int, first: int, last_row: int) -> list[complex]:
+        step = 1 if last_row >= first else -1
+        return [col + row * 1j for row in range(first, last_row + step, step)]
+
+    loop = vertical(1, bottoms[1], tops[1])
+    for col in range(2, last + 1):
+        loop += vertical(col, tops[col - 1], tops[col])
+    loop += vertical(last, tops[last] + 1, bottoms[last])
+    for col in range(last - 1, 1, -1):
+        loop += vertical(col, bottoms[col + 1], bottoms[col])
+
+    pipes = {
+        frozenset((-1j, 1j)): '|', frozenset((-1, 1)): '-',
+        frozenset((-1j, 1)): 'L', frozenset((-1j, -1)): 'J',
+        frozenset((-1, 1j)): '7', frozenset((1, 1j)): 'F'
+    }
+    tiles = [
+        rng.choices('.|-LJ7F', weights=(6, 1, 1, 1, 1, 1, 1), k=size)
+        for _ in range(size)
+    ]
+    for index, coords in enumerate(loop):
+        connections = frozenset((
+            loop[index - 1] - coords, loop[(index + 1) % len(loop)] - coords
+        ))
+        tiles[int(coords.imag)][int(coords.real)] = pipes[connections]
+
+    # Only the two loop pipes next to the start may connect to it
+    start = rng.choice(loop)
+    for direction in (-1j, 1, 1j, -1):
+        neighbour = start + direction
+        if neighbour not in loop:
+            tiles[int(neighbour.imag)][int(neighbour.real)] = '.'
+    tiles[int(start.imag)][int(start.real)] = 'S'
+
+    return '\n'.join(''.join(line) for line in tiles)
+
+def generate_image(size: int, seed: int = 0) -> str:
+    '''`size` x `size` image, with some empty rows and columns'''
+    rng = random.Random(seed)
+    empty_rows = {row for row in range(size) if rng.random() < 0.2}
+    empty_cols = {col for col in range(size) if rng.random() < 0.2}
+    return '\n'.join(
+        ''.join(
+            '#' if (
+                row not in empty_rows and col not in empty_cols
+                and rng.random() < 0.05
+            ) else '.'
+            for col in range(size)
+        ) for row in range(size)
+    )
+
+def generate_spring_records(size: int, seed: int = 0) -> str:
+    '''`size` records of 8 to 20 springs'''
+    rng = random.Random(seed)
+    lines = []
+    while len(lines) < size:
+        springs = ''.join(
+            rng.choice('..#') for _ in range(rng.randint(8, 20))
+        )
+        groups = [len(group) for group in springs.split('.') if group]
+        if not groups:
+            continue
+        masked = ''.join(
+            '?' if rng.random() < 0.4 else spring for spring in springs
+        )
+        lines.append(f'{masked} {",".join(str(group) for group in groups)}')
+    return '\n'.join(lines)
+
+def generate_patterns(size: int, seed: int = 0) -> str:
+    '''`size` patterns of 5 to 17 tiles, each mirrored across one line'''
+    rng = random.Random(seed)
+    patterns = []
+    for _ in range(size):
+        height, width = rng.randint(5, 17), rng.randint(5, 17)
+        lines = [
+            rng.choices('#.', k=width) for _ in range(height)
+        ]
+        # Mirror the lines (or the columns, transposing twice) of one side
+        transpose = rng.random() < 0.5
+        if transpose:
+            lines = [list(column) for column in zip(*lines)]
+        mirror = rng.randint(1, len(lines) - 1)
+        for delta in range(min(mirror, len(lines) - mirror)):
+            lines[mirror + delta] = list(lines[mirror - delta - 1])
+        if transpose:
+            lines = [list(column) for column in zip(*lines)]
+        patterns.append('\n'.join(''.join(line) for line in lines))
+    return '\n\n'.join(patterns)
+
+def generate_platform(size: int, seed: int = 0) -> str:
+    '''`size` x `size` platform'''
+    rng = random.Random(seed)
+    return '\n'.join(
+        ''.join(rng.choices('O#.', weights=(2, 1, 7), k=size))
+        for _ in range(size)
+    )
+
+def generate_initialization_sequence(size: int, seed: int = 0) -> str:
+    '''`size` steps over a pool of `size // 4 + 1` lens labels'''
+    rng = random.Random(seed)
+    labels = [
+        ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6)))
+        for _ in range(size // 4 + 1)
+    ]
+    steps = []
+    for _ in range(size):
+        label = rng.choice(labels)
+        if rng.random() < 0.3:
+            steps.append(f'{label}-')
+        else:
+            steps.append(f'{label}={rng.randint(1, 9)}')
+    return ','.join(steps)
+
+def generate_contraption(size: int, seed: int = 0) -> str:
+    '''`size` x `size` contraption'''
+    rng = random.Random(seed)
+    tiles = ('.', '/', '\\', '|', '-')
+    return '\n'.join(
+        ''.join(rng.choices(tiles, weights=(36, 1, 1, 1, 1), k=size))
+        for _ in range(size)
+    )
+
+def generate_city_map(size: int, seed: int = 0) -> str:
+    '''`size` x `size` city map'''
+    rng = random.Random(seed)
+    return '\n'.join(
+        ''.join(rng.choices('123456789', k=size)) for _ in range(size)
+    )
+
+def generate_dig_plan(size: int, seed: int = 0) -> str:
+    '''Two skylines of `size` columns, one of them in the colour codes'''
+    rng = random.Random(seed)
+
+    def skyline(max_length: int) -> list[tuple[str, int]]:
+        # Up the first column, along the tops, down and back to the start
+        heights = [rng.randint(1, max_length)]
+        while len(heights) < size:
+            height = rng.randint(1, max_length)
+            if height != heights[-1]:
+                heights.append(height)
+        plan = [('U', heights[0])]
+        for height, next_height in zip(heights, heights[1:]):
+            plan.append(('R', rng.randint(1, max_length)))
+            plan.append(
+                ('U', next_height - height) if height < next_height
+                else ('D', height - next_height)
+            )
+        plan.append(('R', rng.randint(1, max_length)))
+        plan.append(('D', heights[-1]))
+        width = sum(length for direction, length in plan if direction == 'R')
+        plan.append(('L', width))
+        return plan
+
+    digits = {'R': 0, 'D': 1, 'L': 2, 'U': 3}
+    return '\n'.join(
+        f'{direction} {length} (#{color_length:05x}{digits[color_direction]})'
+        for (direction, length), (color_direction, color_length) in zip(
+            skyline(9), skyline(0xfffff // (size + 1))
+        )
+    )
+
+def generate_workflows(size: int, seed: int = 0) -> str:
+    '''`size` workflows arranged as a tree, and `size` parts'''
+    rng = random.Random(seed)
+
+    workflow_ids = ['in']
+    while len(workflow_ids) < size:
+        workflow_id = ''.join(rng.choices(string.ascii_lowercase, k=4))
+        if workflow_id not in workflow_ids:
+            workflow_ids.append(workflow_id)
+
+    # Each workflow only sends parts to later ones, so there are no loops
+    lines = []
+    for index, workflow_id in enumerate(workflow_ids):
+        targets = workflow_ids[index + 1:index + 4] + ['A', 'R']
+        rules = [
+            f'{rng.choice("xmas")}{rng.choice("<>")}{rng.randint(1, 4000)}'
+            f':{rng.choice(targets)}'
+            for _ in range(rng.randint(1, 3))
+        ]
+        rules.append(rng.choice(targets))
+        lines.append(f'{workflow_id}{{{",".join(rules)}}}')
+
+    parts = [
+        '{' + ','.join(
+            f'{category}={rng.randint(1, 4000)}' for category in 'xmas'
+        ) + '}'
+        for _ in range(size)
+    ]
+
+    return '\n'.join(lines) + '\n\n' + '\n'.join(parts)
+
+def generate_circuit(size: int, seed: int = 0) -> str:
+    '''`size` 12 bit counters that feed `rx` through a conjunction'''
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < 4 * size + 1:
+        names.add(''.join(rng.choices(string.ascii_lowercase, k=2)))
+    names.discard('rx')
+    names = sorted(names)[:4 * size + 1]
+    rng.shuffle(names)
+    output = names.pop()
+
+    # Each counter is a chain of 12 flip-flops counting button pushes. Its
+    # conjunction reads the flip-flops of the 1 bits of the period, so it
+    # sends a low pulse when the count reaches it. That pulse flips the 0
+    # bits and the first one, carrying the count over to zero, and reaches
+    # `rx` through the inverter and the output conjunction.
+    periods = rng.sample(range(2049, 4096, 2), size)
+    lines, first_bits = [], []
+    for period in periods:
+        counter, inverter = names.pop(), names.pop()
+        prefix = names.pop()
+        bits = [f'{prefix}{index}' for index in range(12)]
+        for index, bit in enumerate(bits):
+            outputs = bits[index + 1:index + 2]
+            if period >> index & 1:
+                outputs.append(counter)
+            lines.append(f'%{bit} -> {", ".join(outputs)}')
+        counter_outputs = [
+            bit for index, bit in enumerate(bits)
+            if not period >> index & 1 or index == 0
+        ]
+        lines.append(f'&{counter} -> {", ".join(counter_outputs + [inverter])}')
+        lines.append(f'&{inverter} -> {output}')
+        first_bits.append(bits[0])
+
+    lines.append(f'&{output} -> rx')
+    lines.append(f'broadcaster -> {", ".join(first_bits)}')
+    rng.shuffle(lines)
+    return '\n'.join(lines)
+
+def generate_garden(size: int, seed: int = 0) -> str:
+    '''Square garden of side `2 * size + 1`, starting in the clear centre'''
+    rng = random.Random(seed)
+    side = 2 * size + 1
+    return '\n'.join(
+        ''.join(
+            'S' if row == col == size
+            else '.' if size in (row, col) or rng.random() > 0.1
+            else '#'
+            for col in range(side)
+        ) for row in range(side)
+    )
+
+def generate_bricks(size: int, seed: int = 0) -> str:
+    '''`size` bricks falling over a 5 x 5 area'''
+    rng = random.Random(seed)
+    lines = []
+    for index in range(size):
+        x, y, z = rng.randrange(5), rng.randrange(5), 4 * index + 1
+        length = rng.randint(0, 3)
+        end = [x, y, z]
+        axis = rng.randrange(3)
+        end[axis] += length
+        end[0], end[1] = min(end[0], 4), min(end[1], 4)
+        lines.append(f'{x},{y},{z}~{end[0]},{end[1]},{end[2]}')
+    return '\n'.join(lines)
+
+def generate_hiking_map(size: int, seed: int = 0) -> str:
+    '''`size` x `size` lattice of junctions joined by sloped corridors'''
+    rng = random.Random(seed)
+    spacing = 6
+    side = 3 + (size - 1) * spacing
+    tiles = [['#'] * side for _ in range(side)]
+
+    def junction(row: int, col: int) -> tuple[int, int]:
+        return 1 + row * spacing, 1 + col * spacing
+
+    for row in range(size):
+        for col in range(size):
+            tile_row, tile_col = junction(row, col)
+            tiles[tile_row][tile_col] = '.'
+            # Top row and last column are always kept to connect start and end
+            if col + 1 < size and (row == 0 or rng.random() > 0.15):
+                for delta in range(1, spacing):
+                    tiles[tile_row][tile_col + delta] = '.'
+                tiles[tile_row][tile_col + 1] = '>'
+                tiles[tile_row][tile_col + spacing - 1] = '>'
+            if row + 1 < size and (col == size - 1 or rng.random() > 0.15):
+                for delta in range(1, spacing):
+                    tiles[tile_row + delta][tile_col] = '.'
+                tiles[tile_row + 1][tile_col] = 'v'
+                tiles[tile_row + spacing - 1][tile_col] = 'v'
+
+    tiles[0][1] = '.'
+    tiles[side - 1][side - 2] = '.'
+    return '\n'.join(''.join(line) for line in tiles)
+
+def generate_hailstones(size: int, seed: int = 0) -> str:
+    '''`size` hailstones that a single thrown rock hits'''
+    rng = random.Random(seed)
+    rock_position = [rng.randint(2 * 10**14, 4 * 10**14) for _ in range(3)]
+    rock_velocity = [rng.randint(-300, 300) for _ in range(3)]
+
+    lines = []
+    times = rng.sample(range(10**11, 10**12), size)
+    for time in times:
+        velocity = rock_velocity
+        while velocity == rock_velocity: # Non zero speeds, not as the rock
+            velocity = [
+                rng.choice((-1, 1)) * rng.randint(1, 300) for _ in range(3)
+            ]
+        position = [
+            rock + time * (rock_speed - speed)
+            for rock, rock_speed, speed in zip(
+                rock_position, rock_velocity, velocity
+            )
+        ]
+        lines.append(
+            f'{", ".join(str(p) for p in position)} @ '
+            f'{", ".join(str(v) for v in velocity)}'
+        )
+    return '\n'.join(lines)
+
+def generate_wiring(size: int, seed: int = 0) -> str:
+    '''Two clusters of `size` components joined by exactly three wires'''
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < 2 * size:
+        names.add(''.join(rng.choices(string.ascii_lowercase, k=3)))
+    names = sorted(names)
+    clusters = (names[:size], names[size:])
+
+    connections: dict[str, set[str]] = {name: set() for name in names}
+    for cluster in clusters:
+        for index, name in enumerate(cluster):
+            # A ring plus random chords keeps every cluster 4-edge-connected
+            others = {cluster[(index + 1) % size], cluster[(index + 2) % size]}
+            others.update(rng.sample(cluster, min(3, size)))
+            others.discard(name)
+            connections[name].update(
+                other for other in others if name not in connections[other]
+            )
+
+    for left, right in zip(
+        rng.sample(clusters[0], 3), rng.sample(clusters[1], 3)
+    ):
+        connections[left].add(right)
+
+    return '\n'.join(
+        f'{name}: {" ".join(sorted(others))}'
+        for name, others in connections.items() if others
+    )
+
+GENERATORS: dict[int, Callable[[int, int], str]] = {
+    1: generate_calibration_document,
+    2: generate_games,
+    3: generate_schematic,
+    4: generate_scratchcards,
+    5: generate_almanac,
+    6: generate_race_sheet,
+    7: generate_hands,
+    8: generate_network,
+    9: generate_histories,
+    10: generate_pipe_maze,
+    11: generate_image,
+    12: generate_spring_records,
+    13: generate_patterns,
+    14: generate_platform,
+    15: generate_initialization_sequence,
+    16: generate_contraption,
+    17: generate_city_map,
+    18: generate_dig_plan,
+    19: generate_workflows,
+    20: generate_circuit,
+    21: generate_garden,
+    22: generate_bricks,
+    23: generate_hiking_map,
+    24: generate_hailstones,
+    25: generate_wiring,
+}
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    try:
+        generator = GENERATORS[day]
+    except KeyError as error:
+        raise ValueError(f'There is no input generator for day {day}') from error
+    return generator(size, seed)
@@ -0,0 +1,111 @@
+'''Dense 2D grid of tiles backed by a numpy uint8 array.
+
+Grid days represent their maps as `set[complex]` / `dict[complex, ...]` keyed
+by `col + row*1j`. `Grid` keeps the same coordinates convention but stores
+one byte per tile (the ASCII code of its character), so big maps take an
+order of magnitude less memory and can be processed with vectorized numpy
+operations. Tiles can also be addressed by flat index (`row * width + col`),
+which is handy to store per-tile state in flat arrays.
+'''
+
+# pylint: disable=missing-function-docstring
+
+from typing import Iterator, Self
+
+import numpy as np
+
+DIRECTIONS = (-1j, 1, 1j, -1) # Up, right, down, left
+
+class Grid:
+
+    def __init__(self, tiles: np.ndarray) -> None:
+        if tiles.ndim != 2:
+            raise ValueError(f'A grid must be 2D, not {tiles.ndim}D')
+        self.tiles = tiles.astype(np.uint8, copy=False)
+
+    @classmethod
+    def from_string(cls, text: str) -> Self:
+        lines = text.strip().splitlines()
+        width = len(lines[0])
+        if any(len(line) != width for line in lines):
+            raise ValueError('All the grid lines must have the same length')
+        tiles = np.frombuffer(
+            ''.join(lines).encode('ascii'), dtype=np.uint8
+        ).reshape(len(lines), width)
+        return cls(tiles.copy())
+
+    @property
+    def height(self) -> int:
+        return self.tiles.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.tiles.shape[1]
+
+    @property
+    def size(self) -> int:
+        return self.tiles.size
+
+    def __getitem__(self, coords: complex) -> str:
+        return chr(self.tiles[int(coords.imag), int(coords.real)])
+
+    def __setitem__(self, coords: complex, tile: str) -> None:
+        self.tiles[int(coords.imag), int(coords.real)] = ord(tile)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return np.array_equal(self.tiles, other.tiles)
+
+    def __str__(self) -> str:
+        return '\n'.join(
+            row.tobytes().decode('ascii') for row in self.tiles
+        )
+
+    def in_bounds(self, coords: complex) -> bool:
+        return 0 <= coords.real < self.width and 0 <= coords.imag < self.height
+
+    def neighbours(self, coords: complex) -> Iterator[complex]:
+        for direction in DIRECTIONS:
+            neighbour = coords + direction
+            if self.in_bounds(neighbour):
+                yield neighbour
+
+    def mask(self, tile: str) -> np.ndarray:
+        '''Boolean array, True where the tile is found'''
+        return self.tiles == ord(tile)
+
+    def find(self, tile: str) -> set[complex]:
+        return to_coords(self.mask(tile))
+
+    # Flat index mode
+
+    @property
+    def flat(self) -> np.ndarray:
+        '''1D view of the tiles, indexed by `row * width + col`'''
+        return self.tiles.reshape(-1)
+
+    def index(self, coords: complex) -> int:
+        return int(coords.imag) * self.width + int(coords.real)
+
+    def coords(self, index: int) -> complex:
+        row, col = divmod(index, self.width)
+        return complex(col, row)
+
+    def flat_neighbours(self, index: int) -> Iterator[int]:
+        row, col = divmod(index, self.width)
+        if row > 0:
+            yield index - self.width
+        if col < self.width - 1:
+            yield index + 1
+        if row < self.height - 1:
+            yield index + self.width
+        if col > 0:
+            yield index - 1
+
+def to_coords(mask: np.ndarray) -> set[complex]:
+    '''Coordinates (`col + row*1j`) of the True tiles of a 2D boolean array'''
+    rows, cols = np.nonzero(mask)
+    return {
+        complex(col, row) for row, col in zip(rows.tolist(), cols.tolist())
+    }
@@ -0,0 +1,286 @@
+'''Run every day of the calendar in a single process and time each stage.
+
+Each `dayNN` module exposes `parse`, `solve_part_1` and (except the last
+day) `solve_part_2`, so the runner can time them separately and return the
+results instead of printing them. Inputs are read from `<input_dir>/dayNN.txt`.
+
+The peak RSS of a process never goes down, so each day is run in a fresh
+process to report its own peak. Days run in-process have no peak RSS.
+'''
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=missing-class-docstring
+
+import argparse
+import csv
+import importlib
+import json
+import multiprocessing
+import numbers
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Iterable, TextIO
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+DAYS = tuple(range(1, 26))
+PARTS = (1, 2)
+
+@dataclass
+class DayReport:
+    day: int
+    part_1: int | str | None = None
+    part_2: int | str | None = None
+    parse_time: float | None = None
+    part_1_time: float | None = None
+    part_2_time: float | None = None
+    peak_rss_kb: int | None = None
+    peak_allocated_bytes: int | None = None
+    error: str | None = None
+
+    @property
+    def total_time(self) -> float:
+        return sum(
+            stage_time for stage_time in (
+                self.parse_time, self.part_1_time, self.part_2_time
+            ) if stage_time is not None
+        )
+
+def load_day(day: int) -> ModuleType:
+    return importlib.import_module(f'advent_of_code_23.day{day:02}')
+
+def get_solver(module: ModuleType, part: int) -> Callable[[Any], Any] | None:
+    return getattr(module, f'solve_part_{part}', None)
+
+def read_input(day: int, input_dir: Path) -> str | None:
+    input_path = Path(input_dir) / f'day{day:02}.txt'
+    if not input_path.is_file():
+        return None
+    return input_path.read_text()
+
+def get_peak_rss_kb() -> int | None:
+    # On Linux ru_maxrss survives fork and exec, the high-water mark of the
+    # memory of the process does not
+    try:
+        with open('/proc/self/status', encoding='ascii') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin': # Reported in bytes instead of KiB
+        peak //= 1024
+    return peak
+
+def to_serializable(value: Any) -> int | str | None:
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    return str(value)
+
+def timed(function: Callable[[Any], Any], argument: Any) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = function(argument)
+    return result, time.perf_counter() - start
+
+def run_day(
+    day: int,
+    input_text: str,
+    trace_allocations: bool = False,
+    parts: Iterable[int] = PARTS,
+    record_rss: bool = False
+) -> DayReport:
+    '''Parse the input and solve the given parts of a day. The input is not
+    parsed when none of the parts is solved by the day.
+
+    `peak_rss_kb` is the peak of the whole process, only recorded if asked.
+    '''
+    report = DayReport(day=day)
+
+    if trace_allocations:
+        tracemalloc.start()
+    try:
+        module = load_day(day)
+        solvers = {
+            part: solver for part in parts
+            if (solver := get_solver(module, part)) is not None
+        }
+        if solvers:
+            parsed, report.parse_time = timed(module.parse, input_text)
+            for part, solver in solvers.items():
+                result, elapsed = timed(solver, parsed)
+                setattr(report, f'part_{part}', to_serializable(result))
+                setattr(report, f'part_{part}_time', elapsed)
+    except Exception as error: # pylint: disable=broad-exception-caught
+        report.error = f'{type(error).__name__}: {error}'
+    finally:
+        if trace_allocations:
+            _, report.peak_allocated_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    if record_rss:
+        report.peak_rss_kb = get_peak_rss_kb()
+
+    return report
+
+def isolated_pool(max_workers: int | None = None) -> ProcessPoolExecutor:
+    '''Pool running each job in a fresh spawned process. A forked one would
+    inherit the peak RSS of this process'''
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        max_tasks_per_child=1,
+        mp_context=multiprocessing.get_context('spawn')
+    )
+
+def run_days(
+    days: Iterable[int],
+    input_dir: Path,
+    trace_allocations: bool = False,
+    isolate: bool = True
+) -> list[DayReport]:
+    '''Run the days one after the other, each in a fresh process if isolated'''
+    inputs = {}
+    for day in days:
+        input_text = read_input(day, input_dir)
+        if input_text is None:
+            print(f'Skipping day {day}: no input found', file=sys.stderr)
+            continue
+        inputs[day] = input_text
+
+    if not isolate:
+        return [
+            run_day(day, input_text, trace_allocations)
+            for day, input_text in inputs.items()
+        ]
+    reports = []
+    with isolated_pool(max_workers=1) as pool:
+        for day, input_text in inputs.items():
+            reports.append(pool.submit(
+                run_day, day, input_text, trace_allocations, record_rss=True
+            ).result())
+    return reports
+
+def write_rows(
+    rows: Iterable[Any], output: TextIO, output_format: str = 'json'
+) -> None:
+    '''Write a sequence of dataclass instances as JSON or CSV'''
+    rows = list(rows)
+    if output_format == 'json':
+        json.dump([asdict(row) for row in rows], output, indent=2)
+        output.write('\n')
+    elif output_format == 'csv':
+        if not rows:
+            return
+        writer = csv.DictWriter(
+            output, fieldnames=[field.name for field in fields(rows[0])]
+        )
+        writer.writeheader()
+        writer.writerows(asdict(row) for row in rows)
+    else:
+        raise ValueError(f'Unknown output format {output_format!r}')
+
+def write_reports(
+    reports: Iterable[DayReport], output: TextIO, output_format: str = 'json'
+) -> None:
+    write_rows(reports, output, output_format)
+
+def load_reports(path: Path) -> list[DayReport]:
+    with open(path, encoding='utf-8') as report_file:
+        return [DayReport(**row) for row in json.load(report_file)]
+
+def parse_days(text: str) -> tuple[int, ...]:
+    days = set()
+    for chunk in text.split(','):
+        if '-' in chunk:
+            first, last = chunk.split('-')
+            days.update(range(int(first), int(last) + 1))
+        else:
+            days.add(int(chunk))
+    unknown = days - set(DAYS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f'Unknown days: {sorted(unknown)}')
+    return tuple(sorted(days))
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m advent_of_code_23',
+        description='Run the Advent of Code 2023 solutions and time them.'
+    )
+    parser.add_argument(
+        '-i', '--input-dir', type=Path, default=Path('inputs'),
+        help='Directory with the dayNN.txt input files (default: inputs)'
+    )
+    parser.add_argument(
+        '-d', '--days', type=parse_days, default=DAYS,
+        help='Days to run, e.g. "1,3,5-7" (default: all)'
+    )
+    parser.add_argument(
+        '-f', '--format', choices=('json', 'csv'), default='json',
+        help='Report format (default: json)'
+    )
+    parser.add_argument(
+        '-o', '--output', type=Path, default=None,
+        help='Write the report to this file instead of stdout'
+    )
+    parser.add_argument(
+        '--trace-allocations', action='store_true',
+        help='Track peak Python allocations per day (slower)'
+    )
+    parser.add_argument(
+        '--in-process', action='store_true',
+        help='Run the days in this process, faster but without peak RSS'
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='Run the days in this many worker processes (default: 1)'
+    )
+    parser.add_argument(
+        '--split-parts', action='store_true',
+        help='With --jobs, schedule each part of a day as a separate job'
+    )
+    parser.add_argument(
+        '--timings', type=Path, default=None,
+        help='JSON report of a previous run, to schedule the slowest days first'
+    )
+    return parser
+
+def main(argv: list[str] | None = None):
+    arguments = build_argument_parser().parse_args(argv)
+    if arguments.jobs > 1:
+        # Imported here, the scheduler depends on this module
+        from advent_of_code_23.scheduler import run_days_parallel # pylint: disable=import-outside-toplevel
+        reports = run_days_parallel(
+            arguments.days,
+            arguments.input_dir,
+            workers=arguments.jobs,
+            split_parts=arguments.split_parts,
+            timings=load_reports(arguments.timings) if arguments.timings else (),
+            trace_allocations=arguments.trace_allocations
+        )
+    else:
+        reports = run_days(
+            arguments.days,
+            arguments.input_dir,
+            arguments.trace_allocations,
+            isolate=not arguments.in_process
+        )
+
+    if arguments.output is None:
+        write_reports(reports, sys.stdout, arguments.format)
+    else:
+        with open(arguments.output, 'w', encoding='utf-8', newline='') as output:
+            write_reports(reports, output, arguments.format)
+
+if __name__ == "__main__":
+    main()
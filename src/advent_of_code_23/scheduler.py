@@ -0,0 +1,120 @@
+'''Run the days (or their parts) in parallel with a pool of processes.
+
+Jobs are submitted longest first, using the times recorded in a previous
+report, so the whole calendar takes roughly as long as the slowest job.
+A job running both parts of a day parses its input once. Split into one job
+per part, the parts can run at the same time but each parses the input.
+'''
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=missing-class-docstring
+
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from advent_of_code_23.runner import (
+    PARTS, DayReport, isolated_pool, read_input, run_day
+)
+
+@dataclass(frozen=True)
+class Job:
+    day: int
+    part: int | None = None # None runs every part
+
+    @property
+    def parts(self) -> tuple[int, ...]:
+        return PARTS if self.part is None else (self.part,)
+
+def estimate_job_time(job: Job, timings: dict[int, DayReport]) -> float:
+    '''Recorded time of a job, infinite if unknown so it is started first'''
+    report = timings.get(job.day)
+    if report is None or report.error:
+        return float('inf')
+    if job.part is None:
+        return report.total_time
+    part_time = getattr(report, f'part_{job.part}_time')
+    if part_time is None:
+        return 0.0
+    return (report.parse_time or 0.0) + part_time
+
+def order_jobs(
+    jobs: Iterable[Job], timings: Iterable[DayReport] = ()
+) -> list[Job]:
+    timings_by_day = {report.day: report for report in timings}
+    return sorted(
+        jobs,
+        key=lambda job: estimate_job_time(job, timings_by_day),
+        reverse=True
+    )
+
+def run_job(
+    job: Job, input_text: str, trace_allocations: bool = False
+) -> DayReport:
+    return run_day(
+        job.day,
+        input_text,
+        trace_allocations=trace_allocations,
+        parts=job.parts,
+        record_rss=True
+    )
+
+def merge_reports(reports: Iterable[DayReport]) -> DayReport:
+    '''Combine the reports of the jobs of the same day'''
+    reports = list(reports)
+    merged = DayReport(day=reports[0].day)
+    errors = []
+    for report in reports:
+        for part in PARTS:
+            for field_name in (f'part_{part}', f'part_{part}_time'):
+                if (value := getattr(report, field_name)) is not None:
+                    setattr(merged, field_name, value)
+        for field_name in ('parse_time', 'peak_rss_kb', 'peak_allocated_bytes'):
+            value = getattr(report, field_name)
+            current = getattr(merged, field_name)
+            if value is not None and (current is None or value > current):
+                setattr(merged, field_name, value)
+        if report.error and report.error not in errors:
+            errors.append(report.error)
+    merged.error = '; '.join(errors) or None
+    return merged
+
+def run_days_parallel(
+    days: Iterable[int],
+    input_dir: Path,
+    workers: int | None = None,
+    split_parts: bool = False,
+    timings: Iterable[DayReport] = (),
+    trace_allocations: bool = False
+) -> list[DayReport]:
+
+    inputs = {}
+    for day in days:
+        input_text = read_input(day, input_dir)
+        if input_text is None:
+            print(f'Skipping day {day}: no input found', file=sys.stderr)
+            continue
+        inputs[day] = input_text
+
+    # The days are only imported by the jobs, so their modules don't weigh
+    # on the peak RSS of the workers. A part with no solver is skipped there.
+    if split_parts:
+        jobs = [Job(day, part) for day in inputs for part in PARTS]
+    else:
+        jobs = [Job(day) for day in inputs]
+    jobs = order_jobs(jobs, timings)
+
+    job_reports: dict[int, list[DayReport]] = {day: [] for day in inputs}
+    # A fresh process per job, so each job reports its own peak RSS
+    with isolated_pool(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            job: pool.submit(
+                run_job, job, inputs[job.day], trace_allocations
+            ) for job in jobs
+        }
+        for job, future in futures.items():
+            job_reports[job.day].append(future.result())
+
+    return [merge_reports(job_reports[day]) for day in inputs]
@@ -0,0 +1,32 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import json
+
+from advent_of_code_23.benchmark import benchmark_day, main
+
+def test_benchmark_day():
+
+    results = benchmark_day(14, sizes=(4, 8))
+
+    assert [result.size for result in results] == [4, 8]
+    assert results[0].input_bytes < results[1].input_bytes
+    for result in results:
+        assert result.error is None
+        assert result.total_time > 0
+        assert result.bytes_per_second > 0
+
+def test_benchmark_day_max_seconds():
+
+    results = benchmark_day(14, sizes=(4, 8), max_seconds=0)
+
+    assert len(results) == 1
+
+def test_main(capsys):
+
+    main(['--days', '9', '--max-seconds', '0'])
+
+    rows = json.loads(capsys.readouterr().out)
+    assert len(rows) == 1
+    assert rows[0]['day'] == 9
+    assert rows[0]['size'] == 20
@@ -1,10 +1,11 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-function-docstring
 
+import numpy as np
 import pytest
 
 from advent_of_code_23.day05 import (
-    AlmanacMapRange, Almanac
+    AlmanacMapRange, Almanac, IntervalMap, merge_ranges
 )
 
 @pytest.fixture(name='almanac_text_example')
@@ -61,6 +62,80 @@ def test_almanac_map_range():
     assert map_range_2.get_destination(51) == 53
     assert map_range_2.get_destination(98) is None
 
+def test_interval_map():
+    interval_map = IntervalMap((
+        AlmanacMapRange(160, 60, 15),
+        AlmanacMapRange(125, 25, 25),
+        AlmanacMapRange(0, 50, 10),
+    ))
+
+    assert interval_map.starts == [25, 50, 60]
+    assert interval_map.stops == [50, 60, 75]
+    assert [interval_map.convert(value) for value in (0, 25, 49, 50, 74, 75)] == [
+        0, 125, 149, 0, 174, 75
+    ]
+    assert interval_map.convert_range(range(30, 80)) == [
+        range(130, 150), range(0, 10), range(160, 175), range(75, 80)
+    ]
+    assert interval_map.convert_range(range(0, 10)) == [range(0, 10)]
+
+def test_interval_map_convert_array():
+    interval_map = IntervalMap((
+        AlmanacMapRange(160, 60, 15),
+        AlmanacMapRange(125, 25, 25),
+    ))
+    values = np.arange(-5, 100, dtype=np.int64)
+
+    converted = interval_map.convert_array(values)
+
+    assert converted.tolist() == [interval_map.convert(value) for value in range(-5, 100)]
+    assert IntervalMap(()).convert_array(values).tolist() == values.tolist()
+
+def test_interval_map_overlapping():
+    with pytest.raises(ValueError):
+        IntervalMap((AlmanacMapRange(0, 10, 5), AlmanacMapRange(0, 14, 5)))
+
+def test_interval_map_then():
+    first = IntervalMap((AlmanacMapRange(50, 98, 2), AlmanacMapRange(52, 50, 48)))
+    second = IntervalMap((
+        AlmanacMapRange(0, 15, 37),
+        AlmanacMapRange(37, 52, 2),
+        AlmanacMapRange(39, 0, 15),
+    ))
+
+    composed = first.then(second)
+
+    for value in range(120):
+        assert composed.convert(value) == second.convert(first.convert(value))
+    assert IntervalMap(()).then(first).starts == first.starts
+
+def test_almanac_find_chain(almanac_text_example):
+    almanac = Almanac.from_string(almanac_text_example)
+
+    chain = almanac.find_chain('soil', 'light')
+
+    assert chain == (('soil', 'fertilizer'), ('fertilizer', 'water'), ('water', 'light'))
+    assert almanac.find_chain('seed', 'seed') == ()
+    with pytest.raises(ValueError):
+        almanac.find_chain('location', 'seed')
+
+def test_almanac_get_composed_map(almanac_text_example):
+    almanac = Almanac.from_string(almanac_text_example)
+
+    composed = almanac.get_composed_map('seed', 'location')
+
+    for seed in range(120):
+        value = seed
+        for source_type, destination_type in almanac.find_chain('seed', 'location'):
+            value = almanac.convert_unit(value, source_type, destination_type)
+        assert composed.convert(seed) == value
+    assert almanac.get_composed_map('seed', 'location') is composed
+
+def test_merge_ranges():
+    assert merge_ranges(
+        (range(10, 20), range(0, 5), range(5, 8), range(15, 30), range(40, 40))
+    ) == [range(0, 8), range(10, 30)]
+
 def test_almanac_and_convert_unit():
     almanac = Almanac(
         seeds=(79, 14, 55, 13),
@@ -116,6 +191,20 @@ def test_almanac_find_seed_location(almanac_text_example):
 
     assert locations == [82, 43, 86, 35]
 
+def test_almanac_find_seed_locations(almanac_text_example):
+
+    almanac = Almanac.from_string(almanac_text_example)
+    seeds = np.arange(200, dtype=np.int64)
+
+    locations = almanac.find_seed_locations(seeds, chunk_size=32)
+    chunks = list(almanac.iter_seed_locations(seeds, chunk_size=32))
+
+    assert locations.tolist() == [almanac.find_seed_location(seed) for seed in range(200)]
+    assert [len(chunk) for chunk in chunks] == [32] * 6 + [8]
+    assert len(almanac.find_seed_locations(seeds[:0])) == 0
+    with pytest.raises(ValueError):
+        list(almanac.iter_seed_locations(seeds, chunk_size=0))
+
 def test_almanac_convert_range_unit():
 
     almanac = Almanac(
@@ -75,3 +75,13 @@ def test_image_expansion_with_rate(image_text_example):
 
     assert sum(super_expanded.calculate_galaxy_paths_lengths()) == 1030
     assert sum(hyper_expanded.calculate_galaxy_paths_lengths()) == 8410
+
+def test_image_total_paths_length(image_text_example):
+    image = Image.from_string(image_text_example)
+
+    for rate in (2, 10, 100):
+        expanded = image.expand_space(rate)
+        assert expanded.total_paths_length() == sum(
+            expanded.calculate_galaxy_paths_lengths()
+        )
+    assert image.expand_space(100).total_paths_length() == 8410
@@ -1,7 +1,12 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-function-docstring
 
-from advent_of_code_23.day12 import find_arrangements, count_arrangements
+import pytest
+
+from advent_of_code_23.day12 import (
+    BoundedCache, bounded_cache, find_arrangements, count_arrangements,
+    iter_arrangements, unfold
+)
 
 def test_find_arrangements_plain():
 
@@ -87,6 +92,27 @@ def test_find_arrangements_example():
         1, 4, 1, 1, 4, 10
     ]
 
+def test_iter_arrangements():
+
+    arrangements = list(iter_arrangements('.??..??...?##.', (1, 1, 3)))
+
+    assert len(arrangements) == 4
+    assert set(arrangements) == find_arrangements('.??..??...?##.', (1, 1, 3))
+    assert list(iter_arrangements('###', (1,))) == []
+    assert list(iter_arrangements('', ())) == ['']
+
+def test_iter_arrangements_limit():
+
+    configuration, damaged = unfold('?###????????', (3, 2, 1))
+
+    first = list(iter_arrangements(configuration, damaged, limit=3))
+    paged = iter_arrangements(configuration, damaged)
+
+    assert len(first) == 3
+    assert len(set(first)) == 3
+    assert [next(paged) for _ in range(3)] == first
+    assert list(iter_arrangements(configuration, damaged, limit=0)) == []
+
 def test_count_arrangements_example_unfolding():
     text = (
         '???.### 1,1,3\n'
@@ -107,3 +133,89 @@ def test_count_arrangements_example_unfolding():
         arrangements_counts.append(count)
 
     assert sum(arrangements_counts) == 525152
+
+def test_count_arrangements_edges():
+
+    assert count_arrangements('', ()) == 1
+    assert count_arrangements('', (1,)) == 0
+    assert count_arrangements('#', ()) == 0
+    assert count_arrangements('???', ()) == 1
+    assert count_arrangements('???', (1,)) == 3
+    assert count_arrangements('?#?', (3,)) == 1
+    assert count_arrangements('?#?', (4,)) == 0
+
+def test_unfold():
+
+    assert unfold('.#', (1,), 3) == ('.#?.#?.#', (1, 1, 1))
+    assert unfold('???.###', (1, 1, 3)) == (
+        '???.###????.###????.###????.###????.###', (1, 1, 3) * 5
+    )
+    with pytest.raises(ValueError):
+        unfold('.#', (1,), 0)
+
+def test_count_arrangements_big_unfold():
+
+    assert count_arrangements(*unfold('???.###', (1, 1, 3), 200)) == 1
+    assert count_arrangements(*unfold('????.#...#...', (4, 1, 1), 100)) == 2 ** 99
+
+def test_count_arrangements_cache():
+
+    count_arrangements.clear()
+
+    assert count_arrangements('???.###', (1, 1, 3)) == 1
+    assert count_arrangements('???.###', (1, 1, 3)) == 1
+    assert count_arrangements('.??..??...?##.', (1, 1, 3)) == 4
+
+    stats = count_arrangements.stats
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+    assert stats.hit_rate == 1 / 3
+    assert count_arrangements.__name__ == 'count_arrangements'
+
+    count_arrangements.clear()
+    assert count_arrangements.stats.size == 0
+
+def test_bounded_cache_eviction():
+
+    calls = []
+
+    @bounded_cache(max_size=2)
+    def square(number):
+        calls.append(number)
+        return number ** 2
+
+    assert [square(number) for number in (1, 2, 1, 3, 2, 1)] == [1, 4, 1, 9, 4, 1]
+    assert calls == [1, 2, 3, 2, 1]
+    assert list(square.results) == [(2,), (1,)]
+    assert (square.hits, square.misses, square.evictions) == (1, 5, 3)
+
+    square.resize(1)
+    assert list(square.results) == [(1,)]
+    assert square.stats.evictions == 4
+
+def test_bounded_cache_keyword_arguments():
+
+    count_arrangements.clear()
+
+    assert count_arrangements(
+        configuration='???.###', damaged_to_find=(1, 1, 3)
+    ) == 1
+    assert count_arrangements('???.###', damaged_to_find=(1, 1, 3)) == 1
+    assert count_arrangements('???.###', damaged_to_find=(1, 1, 3)) == 1
+    assert (count_arrangements.hits, count_arrangements.misses) == (1, 2)
+
+    count_arrangements.clear()
+
+def test_bounded_cache_sizes():
+
+    uncached = BoundedCache(abs, max_size=0)
+    assert uncached(-1) == 1
+    assert uncached(-1) == 1
+    assert (uncached.hits, uncached.misses, uncached.stats.size) == (0, 2, 0)
+
+    unbounded = BoundedCache(abs, max_size=None)
+    for number in range(10_000):
+        unbounded(number)
+    assert unbounded.stats.size == 10_000
+
+    with pytest.raises(ValueError):
+        BoundedCache(abs, max_size=-1)
@@ -134,3 +134,62 @@ def test_platform_multiples_cycles(starting_platform_text):
     platform.tilt_multiple_cycles(1_000_000_000)
 
     assert platform.north_load == 64
+
+def test_platform_tilt_directions():
+
+    text = (
+        'O.#O\n'
+        '.O..\n'
+        'O#.O'
+    )
+
+    platform = Platform.from_string(text)
+    platform.tilt_south()
+    assert platform == Platform.from_string(
+        '..#.\n'
+        'OO.O\n'
+        'O#.O'
+    )
+
+    platform = Platform.from_string(text)
+    platform.tilt_east()
+    assert platform == Platform.from_string(
+        '.O#O\n'
+        '...O\n'
+        'O#.O'
+    )
+
+    platform = Platform.from_string(text)
+    platform.tilt_west()
+    assert platform == Platform.from_string(
+        'O.#O\n'
+        'O...\n'
+        'O#O.'
+    )
+
+def test_platform_multiple_cycles_matches_single_cycles(starting_platform_text):
+
+    for cycles in (1, 2, 3, 10, 25):
+        platform = Platform.from_string(starting_platform_text)
+        platform.tilt_multiple_cycles(cycles)
+
+        expected_platform = Platform.from_string(starting_platform_text)
+        for _ in range(cycles):
+            expected_platform.tilt_cycle()
+
+        assert platform == expected_platform
+
+def test_platform_round_bits():
+
+    text = (
+        '..#..O.O.\n'
+        'O..OO....\n'
+        '..OO.....\n'
+    )
+    platform = Platform.from_string(text)
+
+    assert platform.round_bits.shape == (3, 2)
+    assert platform.round_bits.tolist() == [
+        [0b00000101, 0], [0b10011000, 0], [0b00110000, 0]
+    ]
+    assert platform.north_load == 2*3 + 3*2 + 2*1
@@ -3,7 +3,10 @@
 
 import pytest
 
-from advent_of_code_23.day16 import Direction, next_directions, Contraption
+from advent_of_code_23.day16 import (
+    DIRECTIONS, Direction, next_directions, Contraption,
+    strongly_connected_components
+)
 
 @pytest.fixture(name='example_contraption_text')
 def example_contraption_text_fixture():
@@ -73,3 +76,77 @@ def test_contraption_get_best_beam(example_contraption_text):
     assert best_start == 3
     assert direction == Direction.DOWN
     assert most_energized_tiles == 51
+
+def test_contraption_put_light_big_contraption():
+
+    contraption = Contraption.from_string('\n'.join(['.' * 3000] * 2))
+
+    contraption.put_light_beam(0, Direction.RIGHT)
+
+    assert len(contraption.energized_tiles) == 3000
+
+def test_contraption_energized_counts(example_contraption_text):
+
+    contraption = Contraption.from_string(example_contraption_text)
+    starts = contraption.edge_starts()
+
+    counts = contraption.energized_counts(starts)
+
+    assert len(counts) == 40
+    for (coords, direction), count in zip(starts, counts):
+        contraption.energized_tiles = set()
+        contraption.put_light_beam(coords, direction)
+        assert count == len(contraption.energized_tiles)
+
+def test_contraption_trace(example_contraption_text):
+
+    contraption = Contraption.from_string(example_contraption_text)
+
+    assert contraption.trace(0, Direction.RIGHT) == 46
+    assert contraption.trace(3, Direction.DOWN) == 51
+    assert contraption.energized_tiles == set()
+
+def test_contraption_jumps():
+
+    contraption = Contraption.from_string(
+        '..\\.\n'
+        '....\n'
+        '.|..'
+    )
+
+    jumps = contraption.jumps
+
+    up, down, left, right = (
+        DIRECTIONS.index(direction) for direction in (
+            Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT
+        )
+    )
+    assert jumps[right, 0] == 2
+    assert jumps[right, 3] == 3
+    assert jumps[left, 7] == 4
+    assert jumps[down, 1] == 9
+    assert jumps[up, 10] == 2
+    assert contraption.beam_span(0, right) == (slice(0, 3, 1), 2)
+    assert contraption.beam_span(10, up) == (slice(2, 11, 4), 2)
+
+def test_contraption_get_best_beam_parallel(example_contraption_text):
+
+    contraption = Contraption.from_string(example_contraption_text)
+
+    best, throughputs = contraption.get_best_beam_parallel(
+        workers=2, chunk_size=8
+    )
+
+    assert best == (3, Direction.DOWN, 51)
+    assert sum(throughput.starts for throughput in throughputs) == 40
+    assert all(throughput.seconds > 0 for throughput in throughputs)
+
+def test_strongly_connected_components():
+
+    successors = {1: [2], 2: [3, 4], 3: [1], 4: [5], 5: [4, 6], 6: []}
+
+    components = strongly_connected_components(successors)
+
+    assert [sorted(component) for component in components] == [
+        [6], [4, 5], [1, 2, 3]
+    ]
@@ -3,7 +3,10 @@
 
 import pytest
 
-from advent_of_code_23.day17 import CityMap, Direction
+from advent_of_code_23.day17 import (
+    CRUCIBLE, HORIZONTAL, ULTRA_CRUCIBLE, VERTICAL, CityMap, Crucible,
+    Direction, HeatLossService, SearchStats, pack_state, unpack_state
+)
 
 @pytest.fixture(name='example_map_text')
 def example_map_text_fixture():
@@ -108,3 +111,105 @@ def test_city_map_find_best_ultra_path_example(example_map_text):
         (Direction.RIGHT,) * 8 + (Direction.DOWN,) * 4 +
         (Direction.RIGHT,) * 4 + (Direction.DOWN,) * 8
     )
+
+def test_pack_state():
+
+    state = pack_state(12, HORIZONTAL)
+
+    assert unpack_state(state) == (12, HORIZONTAL)
+    assert pack_state(12, VERTICAL) == state - 1
+
+def test_crucible():
+
+    assert Crucible() == CRUCIBLE
+
+    with pytest.raises(ValueError):
+        Crucible(4, 3)
+
+def test_city_map_find_best_path_custom_crucible():
+
+    city_map = CityMap.from_string(
+        '11111\n'
+        '99991\n'
+        '99991'
+    )
+
+    heat_loss, path = city_map.find_best_path(0, 4+2j, Crucible(1, 5))
+
+    assert heat_loss == 6
+    assert path == (Direction.RIGHT,) * 4 + (Direction.DOWN,) * 2
+
+def test_city_map_search(example_map_text):
+
+    city_map = CityMap.from_string(example_map_text)
+
+    heat_loss, state, predecessors = city_map.search(0, 12+12j, CRUCIBLE)
+    path = city_map.unwind_path(state, predecessors)
+
+    assert heat_loss == 102
+    assert sum(path) == 12 + 12j
+    assert sum(
+        city_map.blocks[coords] for coords in (
+            sum(path[:step]) for step in range(1, len(path) + 1)
+        )
+    ) == 102
+
+def test_city_map_lower_bounds():
+
+    city_map = CityMap.from_string(
+        '241\n321'
+    )
+
+    bounds = city_map.lower_bounds(2+1j)
+
+    assert list(bounds) == [6, 2, 1, 3, 1, 0]
+    assert city_map.lower_bounds(2+1j) is bounds
+
+def test_city_map_search_a_star(example_map_text):
+
+    city_map = CityMap.from_string(example_map_text)
+
+    for crucible, expected_heat_loss in ((CRUCIBLE, 102), (ULTRA_CRUCIBLE, 94)):
+        dijkstra_stats, a_star_stats = SearchStats(), SearchStats()
+        heat_loss, *_ = city_map.search(
+            0, 12+12j, crucible, stats=dijkstra_stats
+        )
+        a_star_heat_loss, *_ = city_map.search(
+            0, 12+12j, crucible, a_star=True, stats=a_star_stats
+        )
+
+        assert heat_loss == a_star_heat_loss == expected_heat_loss
+        assert 0 < a_star_stats.expanded < dijkstra_stats.expanded
+        assert a_star_stats.expanded <= a_star_stats.reached
+
+def test_heat_loss_service(example_map_text):
+
+    city_map = CityMap.from_string(example_map_text)
+    service = HeatLossService(city_map, ULTRA_CRUCIBLE, max_trees=2)
+
+    assert service.find_best_path(0, 12+12j) == city_map.find_best_ultra_path(
+        0, 12+12j
+    )
+    for end in (5+7j, 12, 3+9j):
+        heat_loss, _ = city_map.find_best_path(0, end, ULTRA_CRUCIBLE)
+        assert service.find_heat_loss(0, end) == heat_loss
+    assert service.find_heat_loss(0, 0) == 0
+
+    stats = service.stats
+    assert (stats.hits, stats.misses, stats.evictions) == (4, 1, 0)
+    assert stats.hit_rate == 0.8
+    assert stats.trees == 1
+    assert stats.tree_bytes == 2 * 13 * 13 * 2 * 8
+
+def test_heat_loss_service_eviction(example_map_text):
+
+    service = HeatLossService(CityMap.from_string(example_map_text), max_trees=2)
+
+    for start in (0, 1, 0, 2, 1):
+        service.find_heat_loss(start, 12+12j)
+
+    assert list(service.trees) == [2, 1]
+    assert (service.hits, service.misses, service.evictions) == (1, 4, 2)
+
+    with pytest.raises(ValueError):
+        HeatLossService(CityMap.from_string(example_map_text), max_trees=0)
@@ -118,3 +118,30 @@ def test_tower_get_dropping_bricks_if_desintegrate(example_bricks):
     assert not tower.get_dropping_bricks_if_desintegrate('D')
     assert not tower.get_dropping_bricks_if_desintegrate('E')
     assert not tower.get_dropping_bricks_if_desintegrate('G')
+
+def test_tower_get_dropping_bricks_before_dropping(example_bricks):
+
+    tower = Tower(bricks=example_bricks)
+
+    assert tower.get_dropping_bricks_if_desintegrate('A') == set()
+
+def test_tower_get_dominators(example_bricks):
+
+    tower = Tower(bricks=example_bricks)
+    tower.drop_bricks()
+
+    assert tower.order == list('ABCDEFG')
+    assert tower.positions['F'] == 5
+    assert tower.get_dominators() == {
+        'A': 'FLOOR', 'B': 'A', 'C': 'A', 'D': 'A', 'E': 'A', 'F': 'A',
+        'G': 'F'
+    }
+
+def test_tower_get_falling_counts(example_bricks):
+
+    tower = Tower(bricks=example_bricks)
+    tower.drop_bricks()
+
+    assert tower.get_falling_counts() == {
+        'A': 6, 'B': 0, 'C': 0, 'D': 0, 'E': 0, 'F': 1, 'G': 0
+    }
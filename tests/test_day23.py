@@ -3,7 +3,7 @@
 
 import pytest
 
-from advent_of_code_23.day23 import HikingMap
+from advent_of_code_23.day23 import BranchAndBound, HikingMap, SearchStats
 
 @pytest.fixture(name='example_hiking_map_text')
 def example_hiking_map_text_fixture():
@@ -57,3 +57,159 @@ def test_hiking_map_non_slippery_find_longest_path(example_hiking_map_text):
     _, distance = hiking_map.find_longest_path()
 
     assert distance == 154
+
+def test_hiking_map_compile(example_hiking_map_text):
+
+    hiking_map = HikingMap.from_string(example_hiking_map_text, slippery=False)
+
+    graph = hiking_map.compile()
+
+    assert len(graph.coords) == len(graph.adjacency) == 9
+    assert graph.coords[graph.start] == 1
+    assert graph.coords[graph.end] == 21+22j
+    for node_id, edges in enumerate(graph.adjacency):
+        node = hiking_map.nodes[graph.coords[node_id]]
+        assert {
+            graph.coords[neighbour]: distance for neighbour, distance in edges
+        } == node.edges
+
+def test_junction_graph_pruned_adjacency(example_hiking_map_text):
+
+    graph = HikingMap.from_string(
+        example_hiking_map_text, slippery=False
+    ).compile()
+
+    adjacency = graph.pruned_adjacency()
+
+    last_junctions = [
+        node_id for node_id, edges in enumerate(graph.adjacency)
+        if any(neighbour == graph.end for neighbour, _ in edges)
+    ]
+    assert len(last_junctions) == 1
+    assert [neighbour for neighbour, _ in adjacency[last_junctions[0]]] == [
+        graph.end
+    ]
+
+def test_hiking_map_find_longest_path_route(example_hiking_map_text):
+
+    hiking_map = HikingMap.from_string(example_hiking_map_text, slippery=False)
+
+    path, distance = hiking_map.find_longest_path()
+
+    assert path[0] == hiking_map.start.coords
+    assert path[-1] == hiking_map.end.coords
+    assert len(set(path)) == len(path)
+    assert sum(
+        hiking_map.nodes[node].edges[next_node]
+        for node, next_node in zip(path, path[1:])
+    ) == distance == 154
+
+def test_junction_graph_find_prefixes(example_hiking_map_text):
+
+    graph = HikingMap.from_string(
+        example_hiking_map_text, slippery=False
+    ).compile()
+
+    prefixes = graph.find_prefixes(graph.pruned_adjacency(), 3)
+
+    assert prefixes
+    for path, _ in prefixes:
+        assert path[0] == graph.start
+        assert len(set(path)) == len(path)
+        assert len(path) == 4 or path[-1] == graph.end
+
+def test_hiking_map_find_longest_path_parallel(example_hiking_map_text):
+
+    hiking_map = HikingMap.from_string(example_hiking_map_text, slippery=False)
+
+    (path, distance), stats = hiking_map.find_longest_path_parallel(
+        depth=3, workers=2
+    )
+
+    assert distance == 154
+    assert path[0] == hiking_map.start.coords
+    assert path[-1] == hiking_map.end.coords
+    assert sum(worker.subtrees for worker in stats) == len(
+        hiking_map.compile().find_prefixes(
+            hiking_map.compile().pruned_adjacency(), 3
+        )
+    )
+    assert all(worker.expanded > 0 for worker in stats)
+
+def test_junction_graph_find_longest_path_stats(example_hiking_map_text):
+
+    graph = HikingMap.from_string(
+        example_hiking_map_text, slippery=False
+    ).compile()
+    stats = SearchStats()
+
+    _, distance = graph.find_longest_path(stats)
+
+    assert distance == 154
+    assert stats.expanded > 0
+    assert stats.pruned > 0
+
+def test_branch_and_bound_upper_bound():
+
+    # 0 - 1 - 3 (end), and a dead end 0 - 2
+    adjacency = [[(1, 5), (2, 7)], [(0, 5), (3, 4)], [(0, 7)], [(1, 4)]]
+    search = BranchAndBound(adjacency, end=3)
+
+    assert search.best_entries == [7, 5, 7, 4]
+    assert search.upper_bound(0, 0b0001) == 5 + 7 + 4
+    assert search.upper_bound(1, 0b0011) == 4 # The dead end is cut off
+    assert search.upper_bound(2, 0b0111) == -1
+    assert search.search([0], 0)[:2] == ([0, 1, 3], 9)
+
+def test_hiking_map_parallel_corridors():
+
+    # Two corridors join the same pair of junctions, the longest is kept
+    hiking_map = HikingMap.from_string(
+        '#.#####\n'
+        '#.....#\n'
+        '#.###.#\n'
+        '#.#...#\n'
+        '#.#.###\n'
+        '#.....#\n'
+        '#####.#',
+        slippery=False
+    )
+
+    junctions = [
+        coords for coords in hiking_map.nodes
+        if coords not in (hiking_map.start.coords, hiking_map.end.coords)
+    ]
+    assert sorted(junctions, key=lambda coords: coords.imag) == [1+1j, 3+5j]
+    assert hiking_map.nodes[1+1j].edges[3+5j] == 10
+    assert hiking_map.find_longest_path()[1] == 1 + 10 + 3
+
+def test_hiking_map_unreachable_end():
+
+    with pytest.raises(ValueError):
+        HikingMap.from_string(
+            '#.###\n'
+            '#.#.#\n'
+            '###.#'
+        )
+
+def test_hiking_map_slope_loop():
+
+    hiking_map = HikingMap.from_string(
+        '#.#####\n'
+        '#.#####\n'
+        '#...###\n'
+        '#.#v<##\n'
+        '#.#>^##\n'
+        '#.#####\n'
+        '#.#####'
+    )
+    assert hiking_map.find_longest_path()[1] == 6
+
+    with pytest.raises(ValueError):
+        HikingMap.from_string(
+            '#.###\n'
+            '##>.#\n'
+            '#.<##\n'
+            '#.^.#\n'
+            '###.#'
+        )
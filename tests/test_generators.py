@@ -0,0 +1,39 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import pytest
+
+from advent_of_code_23.benchmark import SIZES
+from advent_of_code_23.generators import GENERATORS, generate
+from advent_of_code_23.runner import DAYS, run_day
+
+def test_every_day_has_a_generator():
+
+    assert set(GENERATORS) == set(DAYS)
+    assert set(SIZES) == set(DAYS)
+
+@pytest.mark.parametrize('day', sorted(GENERATORS))
+def test_generators_are_deterministic(day):
+
+    assert generate(day, 5, seed=1) == generate(day, 5, seed=1)
+    assert generate(day, 5, seed=1) != generate(day, 5, seed=2)
+
+@pytest.mark.parametrize('day', sorted(GENERATORS))
+def test_generated_inputs_are_solvable(day):
+
+    report = run_day(day, generate(day, SIZES[day][0]))
+
+    assert report.error is None
+    assert report.part_1 is not None
+
+def test_generate_unknown_day():
+
+    with pytest.raises(ValueError):
+        generate(26, 10)
+
+def test_generate_out_of_range_sizes():
+
+    with pytest.raises(ValueError):
+        generate(6, 10)
+    with pytest.raises(ValueError):
+        generate(10, 4)
@@ -0,0 +1,63 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import numpy as np
+import pytest
+
+from advent_of_code_23.grid import Grid
+
+@pytest.fixture(name='grid')
+def grid_fixture():
+    return Grid.from_string(
+        '#.O\n'
+        '.#.\n'
+        'O..\n'
+        '...'
+    )
+
+def test_grid(grid):
+
+    assert grid.height == 4
+    assert grid.width == 3
+    assert grid.size == 12
+    assert grid.tiles.dtype == np.uint8
+    assert grid[0] == '#'
+    assert grid[2] == 'O'
+    assert grid[2j] == 'O'
+    assert str(grid) == '#.O\n.#.\nO..\n...'
+
+def test_grid_uneven_lines():
+
+    with pytest.raises(ValueError):
+        Grid.from_string('..\n...')
+
+def test_grid_set_tile(grid):
+
+    grid[1+3j] = '#'
+
+    assert grid[1+3j] == '#'
+    assert grid != Grid.from_string(str(grid).replace('#', '.'))
+
+def test_grid_bounds_and_neighbours(grid):
+
+    assert grid.in_bounds(2+3j)
+    assert not grid.in_bounds(3)
+    assert not grid.in_bounds(-1j)
+    assert set(grid.neighbours(0)) == {1, 1j}
+    assert set(grid.neighbours(1+1j)) == {1, 2+1j, 1+2j, 1j}
+
+def test_grid_find(grid):
+
+    assert grid.find('#') == {0, 1+1j}
+    assert grid.find('O') == {2, 2j}
+    assert grid.find('S') == set()
+    assert grid.mask('#').sum() == 2
+
+def test_grid_flat_index(grid):
+
+    assert grid.index(2+1j) == 5
+    assert grid.coords(5) == 2+1j
+    assert chr(grid.flat[grid.index(2j)]) == 'O'
+    assert set(grid.flat_neighbours(0)) == {1, 3}
+    assert set(grid.flat_neighbours(4)) == {1, 3, 5, 7}
+    assert set(grid.flat_neighbours(11)) == {8, 10}
@@ -0,0 +1,108 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import io
+import json
+
+import pytest
+
+from advent_of_code_23.runner import (
+    DayReport, load_reports, main, parse_days, run_day, run_days, write_reports
+)
+
+@pytest.fixture(name='input_dir')
+def input_dir_fixture(tmp_path):
+    (tmp_path / 'day02.txt').write_text(
+        'Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green\n'
+        'Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue\n'
+        'Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red\n'
+        'Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red\n'
+        'Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green'
+    )
+    (tmp_path / 'day09.txt').write_text(
+        '0 3 6 9 12 15\n'
+        '1 3 6 10 15 21\n'
+        '10 13 16 21 30 45'
+    )
+    return tmp_path
+
+def test_parse_days():
+
+    assert parse_days('1,3,5-7') == (1, 3, 5, 6, 7)
+    assert parse_days('25') == (25,)
+
+def test_run_day(input_dir):
+
+    report = run_day(2, (input_dir / 'day02.txt').read_text())
+
+    assert report.day == 2
+    assert report.part_1 == 8
+    assert report.part_2 == 2286
+    assert report.error is None
+    assert report.parse_time >= 0
+    assert report.part_1_time >= 0
+    assert report.part_2_time >= 0
+    assert report.total_time >= report.parse_time
+    assert report.peak_rss_kb is None
+    assert report.peak_allocated_bytes is None
+
+def test_run_day_trace_allocations(input_dir):
+
+    report = run_day(9, (input_dir / 'day09.txt').read_text(), True)
+
+    assert (report.part_1, report.part_2) == (114, 2)
+    assert report.peak_allocated_bytes > 0
+
+def test_run_day_error():
+
+    report = run_day(2, 'Not a game')
+
+    assert report.error is not None
+    assert report.part_1 is None
+
+def test_run_days_skips_missing_inputs(input_dir):
+
+    reports = run_days((1, 2, 9), input_dir, isolate=False)
+
+    assert [report.day for report in reports] == [2, 9]
+
+def test_run_days_isolated(input_dir):
+
+    # The days must not report the peak of this process
+    ballast = b'x' * (256 * 1024 * 1024)
+    reports = run_days((2, 9), input_dir)
+    in_process_reports = run_days((2, 9), input_dir, isolate=False)
+
+    assert [report.part_1 for report in reports] == [8, 114]
+    assert all(
+        0 < report.peak_rss_kb < len(ballast) // 1024 for report in reports
+    )
+    assert [report.part_1 for report in in_process_reports] == [8, 114]
+    assert all(report.peak_rss_kb is None for report in in_process_reports)
+
+def test_write_reports_json_roundtrip(input_dir, tmp_path):
+
+    reports = run_days((2, 9), input_dir, isolate=False)
+    report_path = tmp_path / 'report.json'
+    with open(report_path, 'w', encoding='utf-8') as output:
+        write_reports(reports, output)
+
+    assert load_reports(report_path) == reports
+
+def test_write_reports_csv():
+
+    output = io.StringIO()
+
+    write_reports([DayReport(day=1, part_1=142)], output, 'csv')
+
+    header, row = output.getvalue().splitlines()
+    assert header.startswith('day,part_1,part_2,parse_time')
+    assert row.startswith('1,142,')
+
+def test_main(input_dir, capsys):
+
+    main(['--input-dir', str(input_dir), '--days', '9'])
+
+    rows = json.loads(capsys.readouterr().out)
+    assert rows[0]['day'] == 9
+    assert rows[0]['part_1'] == 114
@@ -0,0 +1,75 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import pytest
+
+from advent_of_code_23.runner import DayReport, run_days
+from advent_of_code_23.scheduler import (
+    Job, merge_reports, order_jobs, run_days_parallel, run_job
+)
+
+@pytest.fixture(name='input_dir')
+def input_dir_fixture(tmp_path):
+    (tmp_path / 'day01.txt').write_text(
+        'two1nine\n'
+        'eightwothree\n'
+        'abcone2threexyz'
+    )
+    (tmp_path / 'day09.txt').write_text(
+        '0 3 6 9 12 15\n'
+        '1 3 6 10 15 21\n'
+        '10 13 16 21 30 45'
+    )
+    return tmp_path
+
+def test_order_jobs():
+
+    timings = [
+        DayReport(day=1, parse_time=0.1, part_1_time=0.2, part_2_time=0.3),
+        DayReport(day=2, parse_time=0.1, part_1_time=2.0, part_2_time=0.1),
+    ]
+    jobs = [Job(1), Job(2), Job(3)]
+
+    assert order_jobs(jobs, timings) == [Job(3), Job(2), Job(1)]
+
+    part_jobs = [Job(day, part) for day in (1, 2) for part in (1, 2)]
+    assert order_jobs(part_jobs, timings) == [
+        Job(2, 1), Job(1, 2), Job(1, 1), Job(2, 2)
+    ]
+
+def test_run_job_without_solver():
+
+    report = run_job(Job(25, 2), 'Never parsed')
+
+    assert report.error is None
+    assert report.parse_time is None
+    assert report.part_2 is None
+
+def test_merge_reports():
+
+    merged = merge_reports([
+        DayReport(day=9, part_1=114, parse_time=0.1, part_1_time=0.2),
+        DayReport(day=9, part_2=2, part_2_time=0.3, error='Boom'),
+    ])
+
+    assert merged == DayReport(
+        day=9, part_1=114, part_2=2,
+        parse_time=0.1, part_1_time=0.2, part_2_time=0.3, error='Boom'
+    )
+
+@pytest.mark.parametrize('split_parts', (False, True))
+def test_run_days_parallel(input_dir, split_parts):
+
+    # The jobs must not report the peak of this process
+    ballast = b'x' * (256 * 1024 * 1024)
+    reports = run_days_parallel(
+        (1, 2, 9), input_dir, workers=2, split_parts=split_parts
+    )
+    sequential_reports = run_days((1, 9), input_dir, isolate=False)
+
+    assert [report.day for report in reports] == [1, 9]
+    for report, sequential_report in zip(reports, sequential_reports):
+        assert report.part_1 == sequential_report.part_1
+        assert report.part_2 == sequential_report.part_2
+        assert report.error is None
+        assert 0 < report.peak_rss_kb < len(ballast) // 1024